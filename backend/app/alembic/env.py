@@ -1,12 +1,15 @@
+import logging
 from logging.config import fileConfig
 import re
-from sqlalchemy import engine_from_config, create_engine
+from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from sqlalchemy_utils import database_exists, create_database
-from app.core.config import settings
+from app.core.config import get_settings
 from alembic import context
 from sqlmodel import SQLModel
-import app.models # noqa: F401
+# Star-importing loads every model (they are lazy attributes of app.models) so all
+# tables are registered on SQLModel.metadata
+from app.models import *  # noqa: F401,F403
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -17,17 +20,16 @@ config = context.config
 if config.config_file_name is not None:
 	fileConfig(config.config_file_name)
 
+logger = logging.getLogger('alembic.env')
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
-# --- Debugging: Print metadata contents ---
-print("--- Inspecting Alembic Metadata ---")
-print(f"Metadata object: {target_metadata}")
-print(f"Registered tables: {target_metadata.tables}") # Shows tables known to metadata
-print("---------------------------------")
+# Enable with level = DEBUG under [logger_alembic] in alembic.ini
+logger.debug('Registered tables: %s', list(target_metadata.tables))
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -36,22 +38,7 @@ print("---------------------------------")
 
 
 def get_url():
-	return str(settings.SQLALCHEMY_DATABASE_URI)
-
-
-def check_and_create_database():
-	"""Check if database exists and create it if it doesn't."""
-	url = get_url()
-	engine = create_engine(url)
-
-	if not database_exists(engine.url):
-		print(f"Database does not exist. Creating database at {engine.url}")
-		create_database(engine.url)
-		print("Database created successfully!")
-	else:
-		print(f"Database already exists at {engine.url}")
-
-	engine.dispose()
+	return str(get_settings().SQLALCHEMY_DATABASE_URI)
 
 
 def run_migrations_offline() -> None:
@@ -85,9 +72,6 @@ def run_migrations_online() -> None:
 	and associate a connection with the context.
 
 	"""
-	# Check and create database if it doesn't exist
-	check_and_create_database()
-
 	configuration = config.get_section(config.config_ini_section)
 	configuration['sqlalchemy.url'] = get_url()
 	connectable = engine_from_config(
@@ -96,6 +80,14 @@ def run_migrations_online() -> None:
 		poolclass=pool.NullPool,
 	)
 
+	# Create the database if it doesn't exist, reusing the migration engine's URL
+	if not database_exists(connectable.url):
+		logger.info('Database does not exist. Creating database at %r', connectable.url)
+		create_database(connectable.url)
+		logger.debug('Database created successfully')
+	else:
+		logger.debug('Database already exists at %r', connectable.url)
+
 	with connectable.connect() as connection:
 		context.configure(connection=connection, target_metadata=target_metadata)
 
@@ -0,0 +1,37 @@
+"""Default timestamps on the server
+
+Revision ID: 7c5dc8d02b64
+Revises: 371830477462
+Create Date: 2026-10-15 02:49:43.858491
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c5dc8d02b64'
+down_revision: Union[str, None] = '371830477462'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('user', 'refreshtoken', 'authcode', 'credential')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Server defaults are not picked up by autogenerate, set them by hand
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None)
@@ -0,0 +1,46 @@
+"""Store refresh token digests as bytes
+
+Revision ID: df623db40753
+Revises: 7c5dc8d02b64
+Create Date: 2026-10-15 03:10:08.930276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df623db40753'
+down_revision: Union[str, None] = '7c5dc8d02b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows hold the base64 text of the same HMAC digest, convert them in place
+    op.drop_index(op.f('ix_refreshtoken_token'), table_name='refreshtoken')
+    op.alter_column(
+        'refreshtoken',
+        'token',
+        new_column_name='token_hash',
+        type_=sa.LargeBinary(),
+        postgresql_using="decode(token, 'base64')",
+    )
+    op.create_index(op.f('ix_refreshtoken_token_hash'), 'refreshtoken', ['token_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refreshtoken_token_hash'), table_name='refreshtoken')
+    op.alter_column(
+        'refreshtoken',
+        'token_hash',
+        new_column_name='token',
+        type_=sa.VARCHAR(),
+        postgresql_using="encode(token_hash, 'base64')",
+    )
+    op.create_index(op.f('ix_refreshtoken_token'), 'refreshtoken', ['token'], unique=True)
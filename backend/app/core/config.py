@@ -1,7 +1,9 @@
 import secrets
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic import (
+	Field,
 	HttpUrl,
 	PostgresDsn,
 	computed_field,
@@ -30,6 +32,8 @@ class Settings(BaseSettings):
 	ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 	# 60 minutes * 24 hours * 28 days
 	REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 28
+	# How often expired refresh tokens are deleted from the database
+	REFRESH_TOKEN_CLEANUP_INTERVAL_MINUTES: int = Field(default=60, gt=0)
 
 	# run openssl rand -base64 32 to generate
 	CREDS_KEY: str = secrets.token_urlsafe(32)
@@ -39,8 +43,19 @@ class Settings(BaseSettings):
 	# 15 minutes for OTP authentication codes
 	AUTH_CODE_EXPIRE_MINUTES: int = 15
 
+	# bcrypt work factor (log2 rounds) for password hashes. Existing hashes are rehashed
+	# with the new cost on the user's next successful login. Each step doubles the time of a
+	# hash or login check, pick the highest cost that keeps login latency acceptable.
+	BCRYPT_COST: int = Field(default=12, ge=4, le=31)
+
 	# optional
 	SENTRY_DSN: HttpUrl | None = None
+	# Tracing samples a fraction of requests; set SENTRY_TRACES_ENABLED=false to turn it off
+	SENTRY_TRACES_ENABLED: bool = True
+	SENTRY_TRACES_SAMPLE_RATE: float = 0.01
+
+	# Maximum number of operations accepted by one POST /graphql/batch request
+	GRAPHQL_BATCH_MAX_OPERATIONS: int = 10
 
 	# Frontend URL for CORS configuration
 	FRONTEND_URL: str = 'http://localhost:5173'
@@ -54,9 +69,15 @@ class Settings(BaseSettings):
 	DATABASE_POOL_SIZE: int = 10
 	DATABASE_MAX_OVERFLOW: int = 20
 	DATABASE_POOL_TIMEOUT: int = 30
+	# Recycle connections before the server/LB drops them (seconds)
+	DATABASE_POOL_RECYCLE: int = 1800
+	# Validate connections on checkout; disable behind PgBouncer transaction pooling
+	DATABASE_POOL_PRE_PING: bool = True
+	# Log every SQL statement; opt-in only, even in local
+	SQL_ECHO: bool = False
 
 	@computed_field  # type: ignore[prop-decorator]
-	@property
+	@cached_property
 	def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
 		return MultiHostUrl.build(
 			scheme='postgresql+psycopg',
@@ -68,7 +89,13 @@ class Settings(BaseSettings):
 		)
 
 	@computed_field  # type: ignore[prop-decorator]
-	@property
+	@cached_property
+	def SENTRY_DSN_STR(self) -> str:
+		"""The Sentry DSN formatted once as a string, or an empty string when unset."""
+		return str(self.SENTRY_DSN) if self.SENTRY_DSN else ''
+
+	@computed_field  # type: ignore[prop-decorator]
+	@cached_property
 	def CORS_ORIGINS(self) -> list[str]:
 		"""
 		Returns a list of allowed origins for CORS.
@@ -80,4 +107,15 @@ class Settings(BaseSettings):
 		return [self.FRONTEND_URL] if self.FRONTEND_URL else []
 
 
-settings = Settings()  # type: ignore
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+	"""Return the process-wide Settings instance, building it on first use."""
+	return Settings()  # type: ignore
+
+
+# Built eagerly on purpose: the database engine, the JWT constants in auth_service and the
+# app setup in main all read settings at import, so a lazy attribute would be resolved on
+# the first app import anyway. Failing there also reports a missing or invalid variable at
+# startup instead of on the first request that needs it. get_settings() remains the accessor
+# for code that wants the cached instance explicitly.
+settings = get_settings()
@@ -1,26 +1,84 @@
-from typing import Annotated
+import logging
+from typing import Annotated, Any, Optional
 
 from fastapi import Depends
-from sqlmodel import Session, create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.config import settings
+from app.core.config import get_settings
 
-engine = create_engine(
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# The psycopg dialect selects its async driver automatically under create_async_engine,
+# which pools connections with AsyncAdaptedQueuePool
+engine = create_async_engine(
 	str(settings.SQLALCHEMY_DATABASE_URI),
 	pool_size=settings.DATABASE_POOL_SIZE,
 	max_overflow=settings.DATABASE_MAX_OVERFLOW,
 	pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-	# echo=settings.ENVIRONMENT == 'local',  # Enable SQL echo in local/dev
+	pool_recycle=settings.DATABASE_POOL_RECYCLE,
+	pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
 )
 
 
-def get_session():
+def _log_sql(conn, cursor, statement, parameters, context, executemany):
+	logger.info('%s %r', statement, parameters)
+
+
+# SQL logging is opt-in through SQL_ECHO, the listener is not installed otherwise
+if settings.SQL_ECHO:
+	logger.setLevel(logging.INFO)
+	logger.addHandler(logging.StreamHandler())
+	event.listen(engine.sync_engine, 'before_cursor_execute', _log_sql)
+
+
+def create_session() -> AsyncSession:
+	"""Create a new session bound to the application engine."""
+	# Keep attributes loaded after commit, lazy refreshes cannot run implicitly under asyncio
+	return AsyncSession(engine, expire_on_commit=False)
+
+
+async def get_session():
 	try:
-		with Session(engine) as session:
+		async with create_session() as session:
 			yield session
 	except Exception as e:
 		# Optionally, add logging here
 		raise RuntimeError(f'Database session error: {e}')
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+class LazySession:
+	"""
+	Stand-in for an AsyncSession that only creates the session on first use.
+
+	Operations that never touch the database never create a session. The owner
+	is responsible for awaiting close() once the session is no longer needed.
+	"""
+
+	def __init__(self):
+		self._session: Optional[AsyncSession] = None
+
+	def __getattr__(self, name: str) -> Any:
+		if self._session is None:
+			self._session = create_session()
+		return getattr(self._session, name)
+
+	async def close(self) -> None:
+		"""Close the underlying session if it was ever created."""
+		if self._session is not None:
+			await self._session.close()
+			self._session = None
+
+
+async def get_lazy_session():
+	session = LazySession()
+	try:
+		yield session
+	finally:
+		await session.close()
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+LazySessionDep = Annotated[LazySession, Depends(get_lazy_session)]
@@ -0,0 +1,25 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import create_session
+from app.services import AuthService
+
+logger = logging.getLogger(__name__)
+
+
+async def delete_expired_refresh_tokens_periodically() -> None:
+	"""
+	Delete expired refresh tokens every REFRESH_TOKEN_CLEANUP_INTERVAL_MINUTES.
+
+	Runs until cancelled. A failed run is logged and retried at the next interval.
+	"""
+	interval_seconds = settings.REFRESH_TOKEN_CLEANUP_INTERVAL_MINUTES * 60
+	while True:
+		await asyncio.sleep(interval_seconds)
+		try:
+			async with create_session() as session:
+				deleted = await AuthService(session).delete_expired_refresh_tokens()
+			logger.info('Deleted %d expired refresh tokens', deleted)
+		except Exception:
+			logger.exception('Failed to delete expired refresh tokens')
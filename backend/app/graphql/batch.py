@@ -0,0 +1,76 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from pydantic import BaseModel, Field
+from strawberry.http import GraphQLHTTPResponse, process_result
+
+from app.core.config import settings
+from app.core.database import LazySessionDep
+from app.graphql.context import get_context
+from app.graphql.schema import schema
+
+router = APIRouter()
+
+
+class GraphQLOperation(BaseModel):
+	"""A single operation of a batch request, same shape as a regular GraphQL POST body."""
+
+	query: str
+	variables: Optional[Dict[str, Any]] = None
+	operation_name: Optional[str] = Field(default=None, alias='operationName')
+
+
+@router.post('/batch')
+async def execute_batch(
+	operations: List[GraphQLOperation],
+	request: Request,
+	background_tasks: BackgroundTasks,
+	session: LazySessionDep,
+) -> List[GraphQLHTTPResponse]:
+	"""
+	Execute several GraphQL operations sent in one HTTP request.
+
+	All operations share one context, so the token is verified once and a single
+	database session serves the whole batch. They run one after another since an
+	AsyncSession cannot be used concurrently, and results keep the request order.
+
+	Args:
+	    operations: The operations to execute
+	    request: The incoming request
+	    background_tasks: Tasks to run once the response has been sent
+	    session: The lazy database session for the batch
+
+	Returns:
+	    One GraphQL response per operation
+
+	Raises:
+	    HTTPException: If the batch is empty or has too many operations
+	"""
+	if not operations:
+		raise HTTPException(status_code=400, detail='Batch must contain at least one operation')
+	if len(operations) > settings.GRAPHQL_BATCH_MAX_OPERATIONS:
+		raise HTTPException(
+			status_code=400,
+			detail=f'Batch exceeds {settings.GRAPHQL_BATCH_MAX_OPERATIONS} operations',
+		)
+
+	context = await get_context(request=request, session=session)
+	context.request = request
+	context.background_tasks = background_tasks
+	# One session serves every operation of the batch. SessionExtension leaves it open and
+	# get_lazy_session closes it once the endpoint has returned.
+	context.owns_session = False
+
+	results = []
+	for operation in operations:
+		result = await schema.execute(
+			operation.query,
+			variable_values=operation.variables,
+			operation_name=operation.operation_name,
+			context_value=context,
+		)
+		# Shaped like GraphQLRouter.process_result, so each entry is exactly what the
+		# single-operation endpoint would return
+		results.append(process_result(result))
+
+	return results
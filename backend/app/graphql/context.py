@@ -1,13 +1,48 @@
 from typing import Any, Dict, Optional
 
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from strawberry.fastapi import BaseContext
 
-from app.core.database import get_session
+from app.core.database import LazySession
+from app.models import User
 from app.services.auth_service import AuthService
 from app.services.exceptions import InvalidTokenError, TokenExpiredError
+from app.utils.smtp_cache import smtp_status_cache
 
+_BEARER_PREFIX = 'Bearer '
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
 
-async def get_context(request=None, session: Optional[Session] = None) -> Dict[str, Any]:
+
+class GraphQLContext(BaseContext):
+	"""
+	Per-request GraphQL context.
+
+	A plain attribute class that resolvers read through attributes (info.context.user). As
+	a BaseContext it is used as-is by GraphQLRouter instead of being merged into a new dict.
+	"""
+
+	def __init__(self, session: AsyncSession | LazySession):
+		super().__init__()
+		self.session = session
+		# Request-scoped services shared by every resolver of this request
+		self.auth_service = AuthService(session)
+		# The process-wide SMTP status cache, not specific to this request
+		self.smtp_status = smtp_status_cache
+		# The authenticated user, if the request carried a valid access token
+		self.user: Optional[User] = None
+		# GraphQL User objects already built for this request, see db_user_to_graphql_user
+		self.user_cache: Dict[Any, Any] = {}
+		# Set by ensure_authenticated/ensure_admin once their check has passed for this request
+		self.auth_checked = False
+		self.admin_checked = False
+		# Whether SessionExtension closes the session after each operation. Cleared by
+		# callers that run several operations on this context and close it themselves.
+		self.owns_session = True
+
+
+async def get_context(
+	request=None, session: Optional[AsyncSession | LazySession] = None
+) -> GraphQLContext:
 	"""
 	Create and return the GraphQL context.
 
@@ -17,19 +52,18 @@ async def get_context(request=None, session: Optional[Session] = None) -> Dict[s
 
 	Args:
 	    request: The incoming HTTP request
-	    session: Database session (injected by FastAPI if available)
+	    session: Database session or LazySession (injected by FastAPI if available)
 
 	Returns:
-	    A dictionary containing the context information
+	    The GraphQLContext for the request
 	"""
-	context = {}
-
-	# Use the provided session or create a new one
+	# Use the provided session or a lazy one
 	if session is None:
-		# For non-FastAPI contexts or when session isn't provided
-		session = next(get_session())
+		# For non-FastAPI contexts or when session isn't provided, the session is only
+		# created once a resolver uses it and is closed by SessionExtension
+		session = LazySession()
 
-	context['session'] = session
+	context = GraphQLContext(session)
 
 	# If there's no request (e.g., during testing), return early
 	if not request:
@@ -37,19 +71,18 @@ async def get_context(request=None, session: Optional[Session] = None) -> Dict[s
 
 	# Extract the Authorization header
 	auth_header = request.headers.get('Authorization')
-	if not auth_header or not auth_header.startswith('Bearer '):
+	if not auth_header or auth_header[:_BEARER_PREFIX_LEN] != _BEARER_PREFIX:
 		# No valid auth header, return context without user
 		return context
 
 	# Extract the token
-	token = auth_header.replace('Bearer ', '')
+	token = auth_header[_BEARER_PREFIX_LEN:]
 
 	# Validate the token and get the user
 	try:
-		auth_service = AuthService(session)
+		auth_service = context.auth_service
 		payload = auth_service.verify_token_payload(token)
-		user = auth_service.get_user_from_token_payload(payload)
-		context['user'] = user
+		context.user = await auth_service.get_user_from_token_payload(payload)
 	except (InvalidTokenError, TokenExpiredError):
 		# Token is invalid or expired, continue without user in context
 		pass
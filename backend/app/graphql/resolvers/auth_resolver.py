@@ -1,4 +1,5 @@
 import strawberry
+from sqlmodel import update
 from strawberry.types import Info
 
 from app.graphql.types.auth_type import (
@@ -11,8 +12,8 @@ from app.graphql.types.auth_type import (
 	ResetPasswordInput,
 )
 from app.graphql.types.user_type import db_user_to_graphql_user
+from app.models import User
 from app.models.auth_code import AuthCodePurpose as DBAuthCodePurpose
-from app.services.auth_service import AuthService
 from app.services.exceptions import (
 	AuthCodeExpiredError,
 	AuthCodeInvalidError,
@@ -30,18 +31,17 @@ from app.utils.password_validator import validate_password
 @strawberry.type
 class AuthMutation:
 	@strawberry.mutation
-	def login(self, input: LoginInput, info: Info) -> AuthResponse:
+	async def login(self, input: LoginInput, info: Info) -> AuthResponse:
 		"""Login with email and password."""
-		session = info.context['session']
-		auth_service = AuthService(session)
+		auth_service = info.context.auth_service
 
 		# Authenticate the user with the new method that returns AuthenticationResult
-		auth_result = auth_service.authenticate_user(input.email, input.password)
+		auth_result = await auth_service.authenticate_user(input.email, input.password)
 		if not auth_result:
 			raise BadRequestError('Invalid email or password')
 
 		# Convert DB user to GraphQL user using helper function
-		graphql_user = db_user_to_graphql_user(auth_result.user)
+		graphql_user = db_user_to_graphql_user(auth_result.user, info.context.user_cache)
 
 		return AuthResponse(
 			access_token=auth_result.access_token,
@@ -50,17 +50,16 @@ class AuthMutation:
 		)
 
 	@strawberry.mutation
-	def refresh_token(self, input: RefreshTokenInput, info: Info) -> AuthResponse:
+	async def refresh_token(self, input: RefreshTokenInput, info: Info) -> AuthResponse:
 		"""Refresh access token using refresh token."""
-		session = info.context['session']
-		auth_service = AuthService(session)
+		auth_service = info.context.auth_service
 
 		try:
 			# Refresh the token - now returns AuthenticationResult with user included
-			auth_result = auth_service.refresh_access_token(input.refresh_token)
+			auth_result = await auth_service.refresh_access_token(input.refresh_token)
 
 			# Convert DB user to GraphQL user using helper function
-			graphql_user = db_user_to_graphql_user(auth_result.user)
+			graphql_user = db_user_to_graphql_user(auth_result.user, info.context.user_cache)
 
 			return AuthResponse(
 				access_token=auth_result.access_token,
@@ -72,19 +71,17 @@ class AuthMutation:
 			raise InvalidTokenError(str(e))
 
 	@strawberry.mutation
-	def logout(self, refresh_token: str, info: Info) -> bool:
+	async def logout(self, refresh_token: str, info: Info) -> bool:
 		"""Invalidate a refresh token (logout)."""
-		session = info.context['session']
-		auth_service = AuthService(session)
+		auth_service = info.context.auth_service
 
-		success = auth_service.invalidate_refresh_token(refresh_token)
+		success = await auth_service.invalidate_refresh_token(refresh_token)
 		return success
 
 	@strawberry.mutation
-	def request_auth_code(self, input: AuthCodeRequestInput, info: Info) -> bool:
+	async def request_auth_code(self, input: AuthCodeRequestInput, info: Info) -> bool:
 		"""Request an authentication code for login or password reset."""
-		session = info.context['session']
-		auth_service = AuthService(session)
+		auth_service = info.context.auth_service
 
 		# Convert GraphQL enum to DB enum
 		db_purpose = DBAuthCodePurpose.LOGIN
@@ -92,7 +89,12 @@ class AuthMutation:
 			db_purpose = DBAuthCodePurpose.PASSWORD_RESET
 
 		try:
-			success = auth_service.send_auth_code_email(input.email, purpose=db_purpose)
+			# Under the HTTP router the email is delivered after the response is sent
+			success = await auth_service.send_auth_code_email(
+				input.email,
+				purpose=db_purpose,
+				background_tasks=info.context.background_tasks,
+			)
 			return success
 		except (EmailNotRegisteredError, TooManyRequestsError):
 			# For security reasons, always return True even if there was an error
@@ -100,17 +102,16 @@ class AuthMutation:
 			return True
 
 	@strawberry.mutation
-	def login_with_auth_code(self, input: AuthCodeLoginInput, info: Info) -> AuthResponse:
+	async def login_with_auth_code(self, input: AuthCodeLoginInput, info: Info) -> AuthResponse:
 		"""Login with email and authentication code."""
-		session = info.context['session']
-		auth_service = AuthService(session)
+		auth_service = info.context.auth_service
 
 		try:
 			# Authenticate with auth code using the improved method that returns AuthenticationResult
-			auth_result = auth_service.authenticate_with_auth_code(input.email, input.code)
+			auth_result = await auth_service.authenticate_with_auth_code(input.email, input.code)
 
 			# Convert DB user to GraphQL user using helper function
-			graphql_user = db_user_to_graphql_user(auth_result.user)
+			graphql_user = db_user_to_graphql_user(auth_result.user, info.context.user_cache)
 
 			return AuthResponse(
 				access_token=auth_result.access_token,
@@ -122,10 +123,10 @@ class AuthMutation:
 			raise InvalidTokenError(str(e))
 
 	@strawberry.mutation
-	def reset_password(self, input: ResetPasswordInput, info: Info) -> bool:
+	async def reset_password(self, input: ResetPasswordInput, info: Info) -> bool:
 		"""Reset password using authentication code."""
-		session = info.context['session']
-		auth_service = AuthService(session)
+		session = info.context.session
+		auth_service = info.context.auth_service
 
 		try:
 			# Validate password meets security requirements
@@ -136,17 +137,17 @@ class AuthMutation:
 				)
 
 			# Verify the auth code
-			user = auth_service.verify_auth_code(
+			user = await auth_service.verify_auth_code(
 				input.email, input.code, purpose=DBAuthCodePurpose.PASSWORD_RESET
 			)
 
-			# Update the password
-			user.password = auth_service.get_password_hash(input.new_password)
-			session.add(user)
-			session.commit()
-
-			# Invalidate all refresh tokens for this user
-			auth_service.invalidate_all_refresh_tokens_for_user(user.id)
+			# Update the password and invalidate all refresh tokens for this user in one transaction
+			hashed_password = await auth_service.get_password_hash(input.new_password)
+			await session.exec(
+				update(User).where(User.id == user.id).values(password=hashed_password)
+			)
+			await auth_service.invalidate_all_refresh_tokens_for_user(user.id)
+			await session.commit()
 
 			return True
 
@@ -1,7 +1,7 @@
 import strawberry
 from strawberry.types import Info
 
-from app.utils.smtp_cache import SMTPStatusCache
+from app.services.user_service import UserService
 
 
 @strawberry.type
@@ -11,19 +11,17 @@ class GenericQuery:
 		return 'Hello World'
 
 	@strawberry.field
-	def is_smtp_ready(self, info: Info) -> bool:
+	async def is_smtp_ready(self, info: Info) -> bool:
 		"""
 		Check if the SMTP server is ready to send emails.
 
-		Uses a cached result that refreshes periodically.
-		The database session is passed to access SMTP credentials from the database.
+		Uses a result cached for the whole process that refreshes periodically. When a check
+		is due, the SMTP credentials are read through this request's database session.
 		"""
-		# Create a new instance with the database session
-		smtp_status = SMTPStatusCache(db=info.context['session'])
-		return smtp_status.get_status()
+		return await info.context.smtp_status.get_status(info.context.session)
 
 	@strawberry.field
-	def is_first_admin_created(self, info: Info) -> bool:
+	async def is_first_admin_created(self, info: Info) -> bool:
 		"""
 		Check if the first admin user has already been created.
 
@@ -32,7 +30,5 @@ class GenericQuery:
 		Returns:
 			bool: True if any user exists in the system, False otherwise
 		"""
-		from app.services.user_service import UserService
-
-		user_service = UserService(info.context['session'])
-		return user_service.is_first_admin_created()
+		user_service = UserService(info.context.session)
+		return await user_service.is_first_admin_created()
@@ -3,16 +3,16 @@ from strawberry.types import Info
 
 from app.graphql.types.smtp_types import SendTestEmailInput, SMTPSettings, SMTPSettingsInput
 from app.graphql.utils.auth_utils import ensure_admin
-from app.services.credential_service import CredentialService
+from app.services.credential_service import CredentialService, CredentialUpdate
 from app.services.email_service import EmailService
 from app.utils.email_templates import get_test_email
-from app.utils.smtp_cache import SMTPStatusCache
+from app.utils.smtp_cache import smtp_status_cache
 
 
 @strawberry.type
 class SMTPMutation:
 	@strawberry.mutation
-	def update_smtp_settings(self, info: Info, settings: SMTPSettingsInput) -> bool:
+	async def update_smtp_settings(self, info: Info, settings: SMTPSettingsInput) -> bool:
 		"""
 		Update SMTP server settings
 
@@ -28,57 +28,42 @@ class SMTPMutation:
 		# Ensure the user is an admin before allowing SMTP settings changes
 		ensure_admin(info)
 
-		session = info.context['session']
+		session = info.context.session
 		credential_service = CredentialService(session)
 
-		# Store each setting as a separate credential
-		credential_service.set_credential(
-			'SMTP_HOST', settings.host, should_encrypt=False, description='SMTP server hostname'
-		)
-		credential_service.set_credential(
-			'SMTP_PORT', str(settings.port), should_encrypt=False, description='SMTP server port'
-		)
-		credential_service.set_credential(
-			'SMTP_USER', settings.username, should_encrypt=False, description='SMTP username'
-		)
-		credential_service.set_credential(
-			'SMTP_PASSWORD', settings.password, should_encrypt=True, description='SMTP password'
-		)
-		credential_service.set_credential(
-			'SMTP_TLS',
-			str(settings.use_tls).lower(),
-			should_encrypt=False,
-			description='Whether to use TLS',
-		)
-		credential_service.set_credential(
-			'SMTP_SSL',
-			str(settings.use_ssl).lower(),
-			should_encrypt=False,
-			description='Whether to use SSL',
-		)
-		credential_service.set_credential(
-			'EMAILS_FROM_EMAIL',
-			settings.from_email,
-			should_encrypt=False,
-			description='Sender email address',
-		)
+		# Store each setting as a separate credential, written in a single upsert
+		credentials = [
+			CredentialUpdate('SMTP_HOST', settings.host, description='SMTP server hostname'),
+			CredentialUpdate('SMTP_PORT', str(settings.port), description='SMTP server port'),
+			CredentialUpdate('SMTP_USER', settings.username, description='SMTP username'),
+			CredentialUpdate(
+				'SMTP_PASSWORD', settings.password, should_encrypt=True, description='SMTP password'
+			),
+			CredentialUpdate(
+				'SMTP_TLS', str(settings.use_tls).lower(), description='Whether to use TLS'
+			),
+			CredentialUpdate(
+				'SMTP_SSL', str(settings.use_ssl).lower(), description='Whether to use SSL'
+			),
+			CredentialUpdate(
+				'EMAILS_FROM_EMAIL', settings.from_email, description='Sender email address'
+			),
+		]
 
 		if settings.from_name:
-			credential_service.set_credential(
-				'EMAILS_FROM_NAME',
-				settings.from_name,
-				should_encrypt=False,
-				description='Sender name',
+			credentials.append(
+				CredentialUpdate('EMAILS_FROM_NAME', settings.from_name, description='Sender name')
 			)
 
-		# Clear the SMTP cache so the next status check will test the new settings
-		smtp_cache = SMTPStatusCache(session)
-		smtp_cache.last_check = None
+		await credential_service.set_credentials_bulk(credentials)
+
+		# Clear the process-wide SMTP cache so the next status check tests the new settings
+		smtp_status_cache.invalidate()
 
 		return True
 
 	@strawberry.mutation
-	def test_smtp_connection(self, info: Info) -> bool:
+	async def test_smtp_connection(self, info: Info) -> bool:
 		"""
 		Test the SMTP connection with current settings
 
@@ -91,14 +76,16 @@ class SMTPMutation:
 		# Ensure the user is an admin before allowing SMTP testing
 		ensure_admin(info)
 
-		session = info.context['session']
+		session = info.context.session
 		email_service = EmailService(session)
 
+		await email_service.refresh_credentials()
+
 		# Force a fresh connection check
-		return email_service.check_smtp_connection()
+		return await email_service.check_smtp_connection()
 
 	@strawberry.mutation
-	def send_test_email(self, info: Info, input: SendTestEmailInput) -> bool:
+	async def send_test_email(self, info: Info, input: SendTestEmailInput) -> bool:
 		"""
 		Send a test email to verify SMTP settings
 
@@ -114,8 +101,9 @@ class SMTPMutation:
 		# Ensure the user is an admin before allowing to send test emails
 		ensure_admin(info)
 
-		session = info.context['session']
+		session = info.context.session
 		email_service = EmailService(session)
+		await email_service.refresh_credentials()
 
 		# Check if SMTP is configured
 		if not email_service.is_configured():
@@ -125,7 +113,7 @@ class SMTPMutation:
 		html_content, text_content = get_test_email()
 
 		# Send the test email
-		result = email_service.send_email(
+		result = await email_service.send_email(
 			to_email=input.to_email,
 			subject=input.subject,
 			html_content=html_content,
@@ -138,7 +126,7 @@ class SMTPMutation:
 @strawberry.type
 class SMTPQuery:
 	@strawberry.field
-	def get_smtp_settings(self, info: Info) -> SMTPSettings:
+	async def get_smtp_settings(self, info: Info) -> SMTPSettings:
 		"""
 		Get current SMTP server settings
 
@@ -151,11 +139,11 @@ class SMTPQuery:
 		# Ensure the user is an admin before revealing SMTP settings
 		ensure_admin(info)
 
-		session = info.context['session']
+		session = info.context.session
 		email_service = EmailService(session)
 
 		# Refresh credentials from DB to ensure we have latest values
-		email_service.refresh_credentials()
+		await email_service.refresh_credentials()
 
 		return SMTPSettings(
 			host=email_service.host,
@@ -16,30 +16,30 @@ class UserQuery:
 		# Use the utility function to check authentication
 		ensure_authenticated(info)
 
-		db_user = info.context.get('user')
+		db_user = info.context.user
 		# Convert DB user to GraphQL user using helper function
-		return db_user_to_graphql_user(db_user)
+		return db_user_to_graphql_user(db_user, info.context.user_cache)
 
 
 @strawberry.type
 class UserMutation:
 	@strawberry.mutation
-	def register_first_admin(self, input: AdminRegistrationInput, info: Info) -> AuthResponse:
+	async def register_first_admin(self, input: AdminRegistrationInput, info: Info) -> AuthResponse:
 		"""
 		Register the first admin user if no users exist in the system.
 		This can only be performed once when the database is empty.
 		"""
-		session = info.context['session']
+		session = info.context.session
 		user_service = UserService(session)
 
 		try:
 			# Create the first admin and generate tokens
-			user, access_token, refresh_token = user_service.create_first_admin(
+			user, access_token, refresh_token = await user_service.create_first_admin(
 				name=input.name, email=input.email, password=input.password
 			)
 
 			# Convert DB user to GraphQL user
-			graphql_user = db_user_to_graphql_user(user)
+			graphql_user = db_user_to_graphql_user(user, info.context.user_cache)
 
 			# Return auth response with tokens and user
 			return AuthResponse(
@@ -0,0 +1,30 @@
+from typing import Union
+
+import orjson
+from fastapi import Response, status
+from strawberry.fastapi import GraphQLRouter
+from strawberry.http import GraphQLHTTPResponse
+
+
+class ORJSONGraphQLRouter(GraphQLRouter):
+	"""GraphQLRouter that parses request bodies and encodes responses with orjson."""
+
+	def decode_json(self, data: Union[str, bytes]) -> object:
+		return orjson.loads(data)
+
+	def encode_json(self, data: object) -> str:
+		return orjson.dumps(data).decode()
+
+	def create_response(
+		self, response_data: GraphQLHTTPResponse, sub_response: Response
+	) -> Response:
+		# Same as GraphQLRouter.create_response, but keeps the encoded body as bytes
+		response = Response(
+			orjson.dumps(response_data),
+			media_type='application/json',
+			status_code=sub_response.status_code or status.HTTP_200_OK,
+		)
+
+		response.headers.raw.extend(sub_response.headers.raw)
+
+		return response
@@ -1,10 +1,14 @@
 import strawberry
+from graphql.execution import ExecutionContext
+from graphql.validation import NoSchemaIntrospectionCustomRule
+from strawberry.extensions import AddValidationRules, ParserCache, ValidationCache
 
+from app.core.config import settings
 from app.graphql.resolvers.auth_resolver import AuthMutation
 from app.graphql.resolvers.generic_resolver import GenericQuery
 from app.graphql.resolvers.smtp_resolver import SMTPMutation, SMTPQuery
 from app.graphql.resolvers.user_resolver import UserMutation, UserQuery
-from app.graphql.utils import ErrorExtension
+from app.graphql.utils import ErrorExtension, SessionExtension
 
 
 @strawberry.type
@@ -23,8 +27,31 @@ class Mutation:
 	smtp: SMTPMutation = strawberry.field(resolver=lambda: SMTPMutation())
 
 
+class SerialExecutionContext(ExecutionContext):
+	"""
+	Execution context that resolves query fields one at a time, like mutations.
+
+	All resolvers of a request share one AsyncSession, which does not support
+	concurrent operations, so sibling fields must not be awaited in parallel.
+	"""
+
+	def execute_fields(self, parent_type, source_value, path, fields):
+		return self.execute_fields_serially(parent_type, source_value, path, fields)
+
+
+# Clients send the same few documents over and over, so cache parsing and validation
+extensions = [
+	ErrorExtension,
+	SessionExtension,
+	ParserCache(maxsize=256),
+	ValidationCache(maxsize=256),
+]
+if settings.ENVIRONMENT == 'production':
+	extensions.append(AddValidationRules([NoSchemaIntrospectionCustomRule]))
+
 schema = strawberry.Schema(
 	query=Query,
 	mutation=Mutation,
-	extensions=[ErrorExtension],
+	extensions=extensions,
+	execution_context_class=SerialExecutionContext,
 )
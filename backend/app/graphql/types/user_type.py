@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import strawberry
 
@@ -30,17 +30,27 @@ class AdminRegistrationInput:
 	password: str
 
 
-def db_user_to_graphql_user(db_user: DBUser) -> User:
+def db_user_to_graphql_user(
+	db_user: DBUser, cache: Optional[Dict[Tuple[uuid.UUID, datetime], User]] = None
+) -> User:
 	"""
 	Convert a database User model to a GraphQL User type.
 
 	Args:
 	    db_user: The database User model
+	    cache: Optional request-scoped cache keyed by (id, updated_at); conversions of the
+	        same unchanged user are reused instead of rebuilt
 
 	Returns:
 	    A GraphQL User type
 	"""
-	return User(
+	if cache is not None:
+		cache_key = (db_user.id, db_user.updated_at)
+		user = cache.get(cache_key)
+		if user is not None:
+			return user
+
+	user = User(
 		id=db_user.id,
 		name=db_user.name,
 		email=db_user.email,
@@ -50,3 +60,8 @@ def db_user_to_graphql_user(db_user: DBUser) -> User:
 		created_at=db_user.created_at,
 		updated_at=db_user.updated_at,
 	)
+
+	if cache is not None:
+		cache[cache_key] = user
+
+	return user
@@ -1,4 +1,5 @@
 from app.graphql.utils.auth_utils import ensure_admin, ensure_authenticated
 from app.graphql.utils.error_extension import ErrorExtension
+from app.graphql.utils.session_extension import SessionExtension
 
-__all__ = ['ensure_authenticated', 'ensure_admin', 'ErrorExtension']
+__all__ = ['ensure_authenticated', 'ensure_admin', 'ErrorExtension', 'SessionExtension']
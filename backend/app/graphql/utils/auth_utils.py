@@ -7,28 +7,39 @@ def ensure_authenticated(info: Info) -> None:
 	"""
 	Check if the user is authenticated.
 
+	The result is remembered on the context, later calls in the same request return
+	immediately.
+
 	Args:
 	    info: The GraphQL request info containing context
 
 	Raises:
 	    InvalidTokenError: If the user is not authenticated
 	"""
-	if not info.context.get('user'):
+	context = info.context
+	if context.auth_checked:
+		return
+	if not context.user:
 		raise InvalidTokenError('Authentication required')
+	context.auth_checked = True
 
 
 def ensure_admin(info: Info) -> None:
 	"""
 	Check if the user is an admin.
 
+	Like ensure_authenticated, a passed check is remembered on the context.
+
 	Args:
 	    info: The GraphQL request info containing context
 
 	Raises:
 	    InvalidTokenError: If the user is not authenticated or not an admin
 	"""
-	user = info.context.get('user')
-	if not user:
-		raise InvalidTokenError('Authentication required')
-	if not user.is_admin:
+	context = info.context
+	if context.admin_checked:
+		return
+	ensure_authenticated(info)
+	if not context.user.is_admin:
 		raise InvalidTokenError('Admin privileges required')
+	context.admin_checked = True
@@ -1,4 +1,4 @@
-from enum import Enum
+import sys
 
 from strawberry.extensions import SchemaExtension
 
@@ -20,8 +20,8 @@ from app.services.exceptions import (
 )
 
 
-class ErrorCode(str, Enum):
-	"""GraphQL error codes for client error handling"""
+class ErrorCode:
+	"""GraphQL error codes for client error handling, plain string constants"""
 
 	# Authentication errors
 	UNAUTHENTICATED = 'UNAUTHENTICATED'
@@ -69,19 +69,51 @@ ERROR_CODE_MAPPING = {
 }
 
 
-def get_error_code(exception: Exception) -> str:
-	"""Get the appropriate error code for an exception type"""
-	# First check for exact type match
-	if type(exception) in ERROR_CODE_MAPPING:
-		return ERROR_CODE_MAPPING[type(exception)].value
+# Interned codes of the mapped types, ordered most-derived class first regardless of
+# how ERROR_CODE_MAPPING is written
+ERROR_CODE_VALUES = {
+	exception_type: sys.intern(error_code)
+	for exception_type, error_code in sorted(
+		ERROR_CODE_MAPPING.items(), key=lambda item: -len(item[0].__mro__)
+	)
+}
+_DEFAULT_CODE = sys.intern(ErrorCode.INTERNAL_SERVER_ERROR)
+_CODE_KEY = sys.intern('code')
+
 
-	# Then check for inherited types
-	for exception_type, error_code in ERROR_CODE_MAPPING.items():
-		if isinstance(exception, exception_type):
-			return error_code.value
+def _resolve_error_code(exception_type: type) -> str:
+	"""Find the code of the most specific mapped class in the type's hierarchy"""
+	for base in exception_type.__mro__:
+		error_code = ERROR_CODE_VALUES.get(base)
+		if error_code is not None:
+			return error_code
 
 	# Default error code
-	return ErrorCode.INTERNAL_SERVER_ERROR.value
+	return _DEFAULT_CODE
+
+
+def _subclasses(exception_type: type):
+	for subclass in exception_type.__subclasses__():
+		yield subclass
+		yield from _subclasses(subclass)
+
+
+# Resolved code per concrete exception type. Subclasses of the mapped types that already
+# exist are resolved up front, any other type is resolved the first time it is seen.
+_RESOLVED_CODES: dict[type, str] = dict(ERROR_CODE_VALUES)
+for _exception_type in ERROR_CODE_VALUES:
+	for _subclass in _subclasses(_exception_type):
+		if _subclass not in _RESOLVED_CODES:
+			_RESOLVED_CODES[_subclass] = _resolve_error_code(_subclass)
+
+
+def get_error_code(exception: Exception) -> str:
+	"""Get the appropriate error code for an exception type"""
+	exception_type = type(exception)
+	error_code = _RESOLVED_CODES.get(exception_type)
+	if error_code is None:
+		error_code = _RESOLVED_CODES[exception_type] = _resolve_error_code(exception_type)
+	return error_code
 
 
 class ErrorExtension(SchemaExtension):
@@ -99,18 +131,8 @@ class ErrorExtension(SchemaExtension):
 		if not result or not result.errors:
 			return
 
-		# Add error codes to the extensions
+		# Add error codes to the extensions, GraphQLError always initializes extensions to a dict
 		for error in result.errors:
 			exception = error.original_error
-			if not exception:
-				continue
-
-			# Get error code for this exception
-			error_code = get_error_code(exception)
-
-			# Initialize extensions dict if needed
-			if not hasattr(error, 'extensions') or not error.extensions:
-				error.extensions = {}
-
-			# Add the error code to extensions
-			error.extensions['code'] = error_code
+			if exception is not None:
+				error.extensions[_CODE_KEY] = get_error_code(exception)
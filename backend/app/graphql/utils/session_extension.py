@@ -0,0 +1,24 @@
+from strawberry.extensions import SchemaExtension
+
+from app.core.database import LazySession
+
+
+class SessionExtension(SchemaExtension):
+	"""
+	Strawberry extension that closes the request's lazy database session once
+	the operation has finished.
+
+	Contexts with owns_session cleared keep their session open across operations,
+	the caller closes it once they have all run.
+	"""
+
+	async def on_operation(self):
+		yield
+
+		context = self.execution_context.context
+		if not getattr(context, 'owns_session', True):
+			return
+
+		session = getattr(context, 'session', None)
+		if isinstance(session, LazySession):
+			await session.close()
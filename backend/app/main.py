@@ -1,30 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 import sentry_sdk
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from strawberry.fastapi import GraphQLRouter
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
-from app.core.database import SessionDep
+from app.core.database import LazySessionDep
+from app.core.tasks import delete_expired_refresh_tokens_periodically
+from app.graphql.batch import router as graphql_batch_router
 from app.graphql.context import get_context
+from app.graphql.router import ORJSONGraphQLRouter
 from app.graphql.schema import schema
+from app.services.email_service import close_smtp_connections
+from app.utils.security_logger import start_queued_logging, stop_queued_logging
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	# Initialize Sentry on server startup only, not whenever app.main is imported
+	if settings.SENTRY_DSN_STR and settings.ENVIRONMENT != 'local':
+		sentry_sdk.init(
+			dsn=settings.SENTRY_DSN_STR,
+			traces_sample_rate=(
+				settings.SENTRY_TRACES_SAMPLE_RATE if settings.SENTRY_TRACES_ENABLED else None
+			),
+		)
+
+	# Write security logs from a background thread while serving
+	start_queued_logging()
+
+	# Run a trivial operation so strawberry and graphql-core set up their lazily built
+	# execution state now rather than on the first real request
+	await schema.execute('{ __typename }')
 
-if settings.SENTRY_DSN and settings.ENVIRONMENT != 'local':
-	sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
+	# Expired refresh tokens are rejected on use but would otherwise stay in the table
+	token_cleanup = asyncio.create_task(delete_expired_refresh_tokens_periodically())
+	yield
+
+	token_cleanup.cancel()
+	with suppress(asyncio.CancelledError):
+		await token_cleanup
+
+	# Pooled SMTP connections are opened in threadpool workers, close them before exiting
+	close_smtp_connections()
+	stop_queued_logging()
 
 
 # Create a context getter function that uses FastAPI's dependency injection
-async def get_graphql_context(request: Request, session: SessionDep):
+# The session is only opened once a resolver (or token lookup) touches the database
+async def get_graphql_context(request: Request, session: LazySessionDep):
+	# This getter, get_context and get_lazy_session are all coroutines, so FastAPI resolves
+	# the whole chain on the event loop without a threadpool hop; keep them async
 	return await get_context(request=request, session=session)
 
 
-graphql_app = GraphQLRouter(
+graphql_app = ORJSONGraphQLRouter(
 	schema=schema,
 	graphql_ide=settings.ENVIRONMENT == 'local',
 	allow_queries_via_get=False,
 	context_getter=get_graphql_context,
 )
 
-app = FastAPI(title='llmezi api', docs_url=None, redoc_url=None)
+# The API is GraphQL only, so no OpenAPI schema or docs are served
+app = FastAPI(
+	title='llmezi api',
+	docs_url=None,
+	redoc_url=None,
+	openapi_url=None,
+	default_response_class=ORJSONResponse,
+	lifespan=lifespan,
+)
 
 # Configure CORS middleware
 app.add_middleware(
@@ -36,8 +83,13 @@ app.add_middleware(
 )
 
 app.include_router(graphql_app, prefix='/graphql')
+app.include_router(graphql_batch_router, prefix='/graphql')
+
+
+# The root response never changes, encode it once
+_ROOT_CONTENT = b'{"message":"Welcome to the llmezi API!"}'
 
 
 @app.get('/')
 async def read_root():
-	return {'message': 'Welcome to the llmezi API!'}
+	return Response(content=_ROOT_CONTENT, media_type='application/json')
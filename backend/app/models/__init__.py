@@ -1,6 +1,20 @@
-from .auth_code import AuthCode  # noqa: F401
-from .credential import Credential  # noqa: F401
-from .refresh_token import RefreshToken  # noqa: F401
-from .user import User  # noqa: F401
+import importlib
+
+# Models are imported on first access (PEP 562) so importing one model does not load the others
+_MODEL_MODULES = {
+	'AuthCode': 'auth_code',
+	'Credential': 'credential',
+	'RefreshToken': 'refresh_token',
+	'User': 'user',
+}
 
 __all__ = ['User', 'RefreshToken', 'AuthCode', 'Credential']
+
+
+def __getattr__(name: str):
+	module_name = _MODEL_MODULES.get(name)
+	if module_name is None:
+		raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+	value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+	globals()[name] = value
+	return value
@@ -1,15 +1,13 @@
 import uuid
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import TYPE_CHECKING
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
 
 from app.core.config import settings
-from app.utils.datetime import datetime_utcnow
-
-if TYPE_CHECKING:
-	from app.models.user import User
+from app.utils.datetime import UTCNOW_SQL, datetime_utcnow
+from app.utils.uuid import uuid7
 
 
 class AuthCodePurpose(str, Enum):
@@ -25,17 +23,31 @@ class AuthCode(SQLModel, table=True):
 	Typically delivered via email for authentication purposes.
 	"""
 
-	id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-	code: str = Field(index=True)  # The actual OTP code
+	# Lookups only ever target unused codes, so the indexes skip used ones
+	__table_args__ = (
+		Index('ix_authcode_code_active', 'code', postgresql_where=text('is_used = false')),
+		Index(
+			'ix_authcode_user_purpose_active',
+			'user_id',
+			'purpose',
+			postgresql_where=text('is_used = false'),
+		),
+	)
+
+	# Fetch server-generated timestamps with RETURNING instead of lazy loads
+	__mapper_args__ = {'eager_defaults': True}
+
+	id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+	code: str = Field()  # The actual OTP code
 	purpose: AuthCodePurpose = Field(default=AuthCodePurpose.LOGIN)
 	expires_at: datetime = Field(
 		default_factory=lambda: datetime_utcnow()
 		+ timedelta(minutes=settings.AUTH_CODE_EXPIRE_MINUTES)
 	)
 	is_used: bool = Field(default=False)  # Track if the code has been used
-	created_at: datetime = Field(default_factory=datetime_utcnow)
-	updated_at: datetime = Field(default_factory=datetime_utcnow)
+	created_at: datetime = Field(sa_column_kwargs={'server_default': UTCNOW_SQL})
+	updated_at: datetime = Field(
+		sa_column_kwargs={'server_default': UTCNOW_SQL, 'onupdate': UTCNOW_SQL}
+	)
 
-	# Relationship to User
 	user_id: uuid.UUID = Field(foreign_key='user.id')
-	user: 'User' = Relationship(back_populates='auth_codes')
@@ -4,7 +4,8 @@ from typing import Optional
 
 from sqlmodel import Field, SQLModel
 
-from app.utils.datetime import datetime_utcnow
+from app.utils.datetime import UTCNOW_SQL
+from app.utils.uuid import uuid7
 
 
 class Credential(SQLModel, table=True):
@@ -13,12 +14,17 @@ class Credential(SQLModel, table=True):
 	Used to store key-value pairs where values might need to be encrypted.
 	"""
 
-	id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-	key: str = Field(index=True)  # The credential key/name
+	# Fetch server-generated timestamps with RETURNING instead of lazy loads
+	__mapper_args__ = {'eager_defaults': True}
+
+	id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+	key: str = Field(index=True, unique=True)  # The credential key/name
 	value: str = Field()  # The credential value
 	is_value_encrypted: bool = Field(default=False)  # Whether the value is encrypted
-	created_at: datetime = Field(default_factory=datetime_utcnow)
-	updated_at: datetime = Field(default_factory=datetime_utcnow)
+	created_at: datetime = Field(sa_column_kwargs={'server_default': UTCNOW_SQL})
+	updated_at: datetime = Field(
+		sa_column_kwargs={'server_default': UTCNOW_SQL, 'onupdate': UTCNOW_SQL}
+	)
 
 	# Optional description for the credential
 	description: Optional[str] = Field(default=None)
@@ -1,25 +1,31 @@
 import uuid
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
 
 from app.core.config import settings
-from app.utils.datetime import datetime_utcnow
-
-if TYPE_CHECKING:
-	from app.models.user import User
+from app.utils.datetime import UTCNOW_SQL, datetime_utcnow
+from app.utils.uuid import uuid7
 
 
 class RefreshToken(SQLModel, table=True):
-	id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-	token: str = Field(index=True, unique=True)
+	# Tokens are looked up per user and pruned oldest-first by expiry
+	__table_args__ = (Index('ix_refreshtoken_user_expires', 'user_id', 'expires_at'),)
+
+	# Fetch server-generated timestamps with RETURNING instead of lazy loads
+	__mapper_args__ = {'eager_defaults': True}
+
+	id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+	# Raw HMAC-SHA256 digest of the refresh JWT, the token itself is never stored
+	token_hash: bytes = Field(index=True, unique=True)
 	expires_at: datetime = Field(
 		default_factory=lambda: datetime_utcnow()
 		+ timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
 	)
-	created_at: datetime = Field(default_factory=datetime_utcnow)
-	updated_at: datetime = Field(default_factory=datetime_utcnow)
+	created_at: datetime = Field(sa_column_kwargs={'server_default': UTCNOW_SQL})
+	updated_at: datetime = Field(
+		sa_column_kwargs={'server_default': UTCNOW_SQL, 'onupdate': UTCNOW_SQL}
+	)
 
 	user_id: uuid.UUID = Field(foreign_key='user.id')
-	user: 'User' = Relationship(back_populates='refresh_tokens')
@@ -1,28 +1,24 @@
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING, List
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, SQLModel
 
-from app.utils.datetime import datetime_utcnow
-
-# Add type checking blocks
-if TYPE_CHECKING:
-	from app.models.auth_code import AuthCode
-	from app.models.refresh_token import RefreshToken
+from app.utils.datetime import UTCNOW_SQL
+from app.utils.uuid import uuid7
 
 
 class User(SQLModel, table=True):
-	id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
+	# Fetch server-generated timestamps with RETURNING instead of lazy loads
+	__mapper_args__ = {'eager_defaults': True}
+
+	id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
 	name: str
 	avatar: str | None = Field(default=None)
 	email: str = Field(index=True, unique=True)
 	password: str
 	is_admin: bool = Field(default=False)
 	is_active: bool = Field(default=True)  # Adding user account status field
-	created_at: datetime = Field(default_factory=datetime_utcnow)
-	updated_at: datetime = Field(default_factory=datetime_utcnow)
-
-	# Add relationships
-	refresh_tokens: List['RefreshToken'] = Relationship(back_populates='user')
-	auth_codes: List['AuthCode'] = Relationship(back_populates='user')
+	created_at: datetime = Field(sa_column_kwargs={'server_default': UTCNOW_SQL})
+	updated_at: datetime = Field(
+		sa_column_kwargs={'server_default': UTCNOW_SQL, 'onupdate': UTCNOW_SQL}
+	)
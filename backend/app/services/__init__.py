@@ -1,5 +1,20 @@
-from app.services.auth_service import AuthService
-from app.services.credential_service import CredentialService
-from app.services.email_service import EmailService
+import importlib
+
+# Services are imported on first access (PEP 562), so e.g. SMTP and crypto modules
+# are only loaded by code that uses the service needing them
+_SERVICE_MODULES = {
+	'AuthService': 'auth_service',
+	'CredentialService': 'credential_service',
+	'EmailService': 'email_service',
+}
 
 __all__ = ['AuthService', 'CredentialService', 'EmailService']
+
+
+def __getattr__(name: str):
+	module_name = _SERVICE_MODULES.get(name)
+	if module_name is None:
+		raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+	value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+	globals()[name] = value
+	return value
@@ -1,15 +1,21 @@
 import base64
 import hashlib
 import hmac
-import random
-import string
+import secrets
+import time
 import uuid
+from calendar import timegm
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
+from functools import cached_property
 
+import bcrypt
 import jwt
-from passlib.context import CryptContext
-from sqlmodel import Session, select
+import orjson
+from fastapi import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.models import AuthCode, RefreshToken, User
@@ -33,8 +39,85 @@ from app.utils.email_templates import (
 from app.utils.rate_limiter import auth_rate_limiter
 from app.utils.security_logger import security_logger
 
-
-@dataclass
+# JWT keys and decode arguments are fixed for the process, so prepare them once
+_JWT_SECRET_BYTES = settings.JWT_SECRET.encode('utf-8')
+_JWT_REFRESH_SECRET_BYTES = settings.JWT_REFRESH_SECRET.encode('utf-8')
+# Configured once with the claim checks (signature and audience verification are on by
+# default), so decode calls do not pass an options dict.
+# Unlike bcrypt, JWT work stays on the event loop: an HS256 encode or decode takes tens of
+# microseconds, less than the cost of a threadpool round trip.
+_JWT = jwt.PyJWT(options={'require': ['exp', 'iat', 'nbf', 'sub', 'aud', 'typ']})
+_JWT_DECODE_OPTIONS = {
+	'algorithms': [settings.JWT_ALGORITHM],
+	'audience': settings.JWT_AUDIENCE,
+}
+
+# Recently verified access tokens: token -> (payload, epoch time until which the entry is
+# used). Entries never outlive the token's exp; access tokens cannot be revoked before
+# they expire, so the cache only skips decoding the same token again and again.
+_VERIFIED_TOKEN_TTL_SECONDS = 10
+_VERIFIED_TOKEN_MAXSIZE = 10_000
+_verified_tokens: dict[str, tuple[dict, float]] = {}
+
+# Token lifetimes are fixed for the process
+_ACCESS_TOKEN_EXPIRE_DELTA = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_TOKEN_EXPIRE_DELTA = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+
+# HS256 tokens are assembled directly from a fixed header segment, an orjson payload and
+# pre-keyed HMAC state; decoding and claim validation stay with PyJWT
+_HS256_FAST_PATH = settings.JWT_ALGORITHM == 'HS256'
+_HS256_SIGNING_PREFIX = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=') + b'.'
+_HS256_SIGNERS = {
+	key: hmac.new(key, digestmod=hashlib.sha256)
+	for key in (_JWT_SECRET_BYTES, _JWT_REFRESH_SECRET_BYTES)
+}
+_JWT_TIME_CLAIMS = ('exp', 'iat', 'nbf')
+
+# Keyed HMAC-SHA256 state for token and code hashes, copied per hash instead of re-keying
+_TOKEN_HMAC = hmac.new(_JWT_SECRET_BYTES, digestmod=hashlib.sha256)
+
+# bcrypt work factor for password hashes
+_BCRYPT_ROUNDS = settings.BCRYPT_COST
+
+
+def _encode_jwt(payload: dict, key: bytes) -> str:
+	"""Encode a JWT signed with one of the JWT secrets, like PyJWT would."""
+	if not _HS256_FAST_PATH:
+		return _JWT.encode(payload, key, algorithm=settings.JWT_ALGORITHM)
+
+	# Time claims are NumericDate seconds, as PyJWT converts them
+	for claim in _JWT_TIME_CLAIMS:
+		value = payload.get(claim)
+		if isinstance(value, datetime):
+			payload[claim] = timegm(value.utctimetuple())
+
+	payload_segment = base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b'=')
+	signing_input = _HS256_SIGNING_PREFIX + payload_segment
+	signer = _HS256_SIGNERS[key].copy()
+	signer.update(signing_input)
+	signature = base64.urlsafe_b64encode(signer.digest()).rstrip(b'=')
+	return (signing_input + b'.' + signature).decode('ascii')
+
+
+def _hash_password(password: str) -> str:
+	"""Hash a password with the bcrypt C extension."""
+	return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)).decode(
+		'utf-8'
+	)
+
+
+def _password_needs_rehash(hashed_password: str) -> bool:
+	"""Check whether a bcrypt hash ($2b$<cost>$...) uses a different cost than configured."""
+	cost = hashed_password[4:6]
+	return not cost.isdigit() or int(cost) != _BCRYPT_ROUNDS
+
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+	"""Check a password against a bcrypt hash with the bcrypt C extension."""
+	return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+@dataclass(slots=True)
 class AuthenticationResult:
 	"""Standardized result for authentication methods."""
 
@@ -44,7 +127,7 @@ class AuthenticationResult:
 
 
 class AuthService:
-	def __init__(self, db: Session):
+	def __init__(self, db: AsyncSession):
 		"""
 		Initialize the authentication service.
 
@@ -52,30 +135,39 @@ class AuthService:
 			db: The database session to use for database operations
 		"""
 		self.db = db
-		# Using bcrypt directly with rounds parameter to avoid passlib bcrypt version issues
-		self.pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto', bcrypt__rounds=12)
-		self.email_service = EmailService(db)
-		# Secret key for HMAC token operations
-		self._token_secret = settings.JWT_SECRET.encode('utf-8')
 		self._max_refresh_tokens_per_user = 10
 
+	@cached_property
+	def email_service(self) -> EmailService:
+		"""
+		Email service for auth code emails.
+
+		An AuthService is built for every GraphQL request, but only the auth code mutations
+		send email, so the email service (and its credential service) is created on first use.
+		"""
+		return EmailService(self.db)
+
 	# 1. Password Methods
-	def get_password_hash(self, password: str) -> str:
+	async def get_password_hash(self, password: str) -> str:
 		"""
 		Generate a password hash using bcrypt.
 
+		Hashing is deliberately slow, so it runs in the threadpool to keep the event loop free.
+
 		Args:
 			password: The plain text password to hash
 
 		Returns:
 			The hashed password string
 		"""
-		return self.pwd_context.hash(password)
+		return await run_in_threadpool(_hash_password, password)
 
-	def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+	async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
 		"""
 		Verify a plain text password against a hashed password.
 
+		Verification runs in the threadpool, like get_password_hash.
+
 		Args:
 			plain_password: The plain text password to verify
 			hashed_password: The hashed password to check against
@@ -83,7 +175,7 @@ class AuthService:
 		Returns:
 			True if the password matches, False otherwise
 		"""
-		return self.pwd_context.verify(plain_password, hashed_password)
+		return await run_in_threadpool(_check_password, plain_password, hashed_password)
 
 	def hash_token(self, token: str) -> str:
 		"""
@@ -95,13 +187,24 @@ class AuthService:
 		Returns:
 			The hashed token string (base64 encoded)
 		"""
-		# Create an HMAC signature using SHA-256
-		digest = hmac.new(
-			key=self._token_secret, msg=token.encode('utf-8'), digestmod=hashlib.sha256
-		).digest()
-
 		# Return base64 encoded string for storage
-		return base64.b64encode(digest).decode('utf-8')
+		return base64.b64encode(self.token_digest(token)).decode('utf-8')
+
+	def token_digest(self, token: str) -> bytes:
+		"""
+		Generate the raw 32-byte HMAC-SHA256 digest of a token.
+
+		Refresh tokens are stored and looked up by this digest.
+
+		Args:
+			token: The token string to hash
+
+		Returns:
+			The digest bytes
+		"""
+		token_hmac = _TOKEN_HMAC.copy()
+		token_hmac.update(token.encode('utf-8'))
+		return token_hmac.digest()
 
 	def verify_token_hash(self, plain_token: str, hashed_token: str) -> bool:
 		"""
@@ -122,7 +225,11 @@ class AuthService:
 
 	# 2. Token Creation Methods
 	def create_access_token(
-		self, subject: str | uuid.UUID, expires_delta: timedelta | None = None
+		self,
+		subject: str | uuid.UUID,
+		expires_delta: timedelta | None = None,
+		*,
+		now: datetime | None = None,
 	) -> str:
 		"""
 		Create a JWT access token for a user.
@@ -130,34 +237,33 @@ class AuthService:
 		Args:
 			subject: The user ID or subject identifier for the token
 			expires_delta: Optional custom expiration time delta, defaults to settings.ACCESS_TOKEN_EXPIRE_MINUTES
+			now: The issue time, for callers that already read the clock for this operation
 
 		Returns:
 			The encoded JWT access token string
 		"""
-		if expires_delta:
-			expire = datetime_utcnow() + expires_delta
-		else:
-			expire = datetime_utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-
-		# Get current time for both iat (Issued At) and nbf (Not Before) claims
-		current_time = datetime_utcnow()
+		# Read the clock once for exp, iat (Issued At) and nbf (Not Before)
+		current_time = now or datetime_utcnow()
+		expire = current_time + (expires_delta or _ACCESS_TOKEN_EXPIRE_DELTA)
+		issued_at = timegm(current_time.utctimetuple())
+		subject_str = str(subject)
 
 		to_encode = {
 			'exp': expire,
-			'sub': str(subject),
-			'iat': current_time,
-			'nbf': current_time,  # Not Before claim to prevent token reuse attacks
+			'sub': subject_str,
+			'iat': issued_at,
+			'nbf': issued_at,  # Not Before claim to prevent token reuse attacks
 			'typ': 'access',  # Token type claim
 			'aud': settings.JWT_AUDIENCE,  # Audience claim
-			'jti': str(uuid.uuid4()),  # Add a unique JWT ID for tracking/revocation
+			'jti': uuid.uuid4().hex,  # Add a unique JWT ID for tracking/revocation
 		}
-		encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+		encoded_jwt = _encode_jwt(to_encode, _JWT_SECRET_BYTES)
 
 		# Log access token creation
-		security_logger.log_token_creation('access', str(subject))
+		security_logger.log_token_creation('access', subject_str)
 		return encoded_jwt
 
-	def create_refresh_token(
+	async def create_refresh_token(
 		self, user_id: uuid.UUID, expires_delta: timedelta | None = None
 	) -> str:
 		"""
@@ -171,72 +277,86 @@ class AuthService:
 		Returns:
 			The refresh token string
 		"""
-		if expires_delta:
-			expire = datetime_utcnow() + expires_delta
-		else:
-			expire = datetime_utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+		encoded_refresh_jwt = await self._add_refresh_token(user_id, expires_delta)
+		await self.db.commit()
 
-		# Get current time for both iat and nbf claims
-		current_time = datetime_utcnow()
+		# Log refresh token creation
+		security_logger.log_token_creation('refresh', str(user_id))
+
+		# Return the plaintext token directly
+		return encoded_refresh_jwt
+
+	async def _add_refresh_token(
+		self,
+		user_id: uuid.UUID,
+		expires_delta: timedelta | None = None,
+		*,
+		now: datetime | None = None,
+	) -> str:
+		"""
+		Create a refresh token and add its record to the session, without committing.
+
+		Args:
+			user_id: The user's ID to associate with the token
+			expires_delta: Optional custom expiration time delta
+			now: The issue time, for callers that already read the clock for this operation
+
+		Returns:
+			The refresh token string
+		"""
+		# Read the clock once for exp, iat and nbf
+		current_time = now or datetime_utcnow()
+		expire = current_time + (expires_delta or _REFRESH_TOKEN_EXPIRE_DELTA)
+		issued_at = timegm(current_time.utctimetuple())
 
 		# Create JWT payload for refresh token
 		to_encode = {
 			'exp': expire,
 			'sub': str(user_id),
-			'iat': current_time,
-			'nbf': current_time,  # Not Before claim to prevent token reuse attacks
+			'iat': issued_at,
+			'nbf': issued_at,  # Not Before claim to prevent token reuse attacks
 			'typ': 'refresh',  # Token type claim
 			'aud': settings.JWT_AUDIENCE,  # Audience claim
-			'jti': str(uuid.uuid4()),  # Add a unique JWT ID for tracking/revocation
+			'jti': uuid.uuid4().hex,  # Add a unique JWT ID for tracking/revocation
 		}
 		# Encode using the REFRESH secret
-		encoded_refresh_jwt = jwt.encode(
-			to_encode, settings.JWT_REFRESH_SECRET, algorithm=settings.JWT_ALGORITHM
-		)
-
-		# Generate a hash of the token to store in the database
-		token_hash = self.hash_token(encoded_refresh_jwt)
+		encoded_refresh_jwt = _encode_jwt(to_encode, _JWT_REFRESH_SECRET_BYTES)
 
-		# Store the hash of the JWT in the database record, not the token itself
+		# Store the digest of the JWT in the database record, not the token itself
 		db_refresh_token = RefreshToken(
-			token=token_hash,  # Store the HASH of the JWT, not the plaintext token
+			token_hash=self.token_digest(encoded_refresh_jwt),
 			user_id=user_id,
 			expires_at=expire,  # Keep DB expiry for potential cleanup/secondary checks
 		)
 
 		# Enforce maximum number of refresh tokens per user
-		# 1. Get all current refresh tokens for this user
+		# 1. Get the ids of all current refresh tokens for this user
 		statement = (
-			select(RefreshToken)
+			select(RefreshToken.id)
 			.where(RefreshToken.user_id == user_id)
 			.order_by(RefreshToken.expires_at.desc())
 		)
-		existing_tokens = self.db.exec(statement).all()
+		existing_token_ids = (await self.db.exec(statement)).all()
 
 		# 2. If the number of tokens (including the new one) exceeds the limit, delete oldest tokens
-		if len(existing_tokens) >= self._max_refresh_tokens_per_user:
+		if len(existing_token_ids) >= self._max_refresh_tokens_per_user:
 			# Calculate how many tokens to remove to stay under the limit (considering we're adding one)
-			tokens_to_remove = len(existing_tokens) - self._max_refresh_tokens_per_user + 1
+			tokens_to_remove = len(existing_token_ids) - self._max_refresh_tokens_per_user + 1
 
-			# Get the tokens to delete (the oldest ones)
-			tokens_to_delete = existing_tokens[-tokens_to_remove:]
-
-			# Delete the oldest tokens
-			for old_token in tokens_to_delete:
-				self.db.delete(old_token)
+			# Delete the oldest tokens with a single statement
+			await self.db.exec(
+				delete(RefreshToken).where(
+					RefreshToken.id.in_(existing_token_ids[-tokens_to_remove:])
+				)
+			)
+			for _ in range(tokens_to_remove):
 				security_logger.log_token_invalidation(
 					'refresh', user_id=str(user_id), details={'reason': 'max_tokens_limit_enforced'}
 				)
 
 		# 3. Add the new token
 		self.db.add(db_refresh_token)
-		self.db.commit()
-		self.db.refresh(db_refresh_token)
-
-		# Log refresh token creation
-		security_logger.log_token_creation('refresh', str(user_id))
 
-		# Return the plaintext token directly
 		return encoded_refresh_jwt
 
 	# 3. Token Verification & User Retrieval Methods
@@ -254,14 +374,21 @@ class AuthService:
 			TokenExpiredError: If the token has expired
 			InvalidTokenError: If the token is invalid
 		"""
+		now = time.time()
+		cached = _verified_tokens.get(token)
+		if cached is not None:
+			payload, valid_until = cached
+			if now < valid_until:
+				security_logger.log_token_validation('access', True, user_id=payload.get('sub'))
+				return payload
+			_verified_tokens.pop(token, None)
+
 		try:
 			# Add audience verification and specify expected token type
-			payload = jwt.decode(
+			payload = _JWT.decode(
 				token,
-				settings.JWT_SECRET,
-				algorithms=[settings.JWT_ALGORITHM],
-				audience=settings.JWT_AUDIENCE,
-				options={'verify_signature': True, 'verify_aud': True},
+				_JWT_SECRET_BYTES,
+				**_JWT_DECODE_OPTIONS,
 			)
 
 			# Verify token type is 'access'
@@ -271,6 +398,14 @@ class AuthService:
 				)
 				raise InvalidTokenError('Invalid token type')
 
+			# Remember the verified payload, dropping the oldest entry when full
+			if len(_verified_tokens) >= _VERIFIED_TOKEN_MAXSIZE:
+				_verified_tokens.pop(next(iter(_verified_tokens)), None)
+			_verified_tokens[token] = (
+				payload,
+				min(now + _VERIFIED_TOKEN_TTL_SECONDS, payload['exp']),
+			)
+
 			user_id = payload.get('sub')
 			security_logger.log_token_validation('access', True, user_id=user_id)
 			return payload
@@ -281,7 +416,7 @@ class AuthService:
 			security_logger.log_token_validation('access', False, details={'reason': 'invalid'})
 			raise InvalidTokenError('Invalid token') from e
 
-	def get_user_from_token_payload(self, payload: dict) -> User | None:
+	async def get_user_from_token_payload(self, payload: dict) -> User | None:
 		"""
 		Retrieve a user based on a token payload.
 
@@ -303,7 +438,7 @@ class AuthService:
 		except ValueError as e:
 			raise InvalidTokenError('Invalid token payload: Invalid subject UUID format') from e
 
-		user = self.db.get(User, user_id)
+		user = await self.db.get(User, user_id)
 
 		# Check if user exists and is active
 		if not user:
@@ -314,7 +449,9 @@ class AuthService:
 		return user
 
 	# 4. Authentication & Refresh Methods
-	def authenticate_user(self, email: str, password: str) -> User | AuthenticationResult | None:
+	async def authenticate_user(
+		self, email: str, password: str
+	) -> User | AuthenticationResult | None:
 		"""
 		Authenticate a user with email and password.
 
@@ -328,44 +465,45 @@ class AuthService:
 		Note:
 			This method includes rate limiting to prevent brute force attacks
 		"""
-		# Check if this email is rate limited
-		is_limited, attempts_remaining = auth_rate_limiter.is_rate_limited(email)
+		# Check the rate limit and count this attempt; a successful login resets it below
+		is_limited, attempts_remaining = auth_rate_limiter.check_and_record(email)
 		if is_limited:
 			# The rate limiter has detected too many failed attempts
 			security_logger.log_rate_limit_hit(email, 'AUTH_ATTEMPT', {'attempts_remaining': 0})
 			return None
 
 		statement = select(User).where(User.email == email)
-		user = self.db.exec(statement).first()
+		user = (await self.db.exec(statement)).first()
 
 		if not user:
-			# Record failed attempt for non-existent user
-			auth_rate_limiter.record_attempt(email)
 			security_logger.log_login_attempt(email, False, details={'reason': 'user_not_found'})
 			return None
 
-		if not self.verify_password(password, user.password):
-			# Record failed attempt for incorrect password
-			auth_rate_limiter.record_attempt(email)
+		if not await self.verify_password(password, user.password):
 			security_logger.log_login_attempt(
 				email, False, details={'reason': 'invalid_password', 'user_id': str(user.id)}
 			)
 			return None
 
+		# Upgrade (or downgrade) the hash to the configured cost, the change is committed
+		# together with the refresh token below
+		if _password_needs_rehash(user.password):
+			user.password = await self.get_password_hash(password)
+
 		# Successful login - reset the rate limiter for this email
 		auth_rate_limiter.reset(email)
 		security_logger.log_login_attempt(email, True, details={'user_id': str(user.id)})
 
 		# Generate tokens
 		access_token = self.create_access_token(subject=user.id)
-		refresh_token = self.create_refresh_token(user_id=user.id)
+		refresh_token = await self.create_refresh_token(user_id=user.id)
 
 		# Return the complete authentication result
 		return AuthenticationResult(
 			access_token=access_token, refresh_token=refresh_token, user=user
 		)
 
-	def refresh_access_token(self, refresh_token_str: str) -> AuthenticationResult:
+	async def refresh_access_token(self, refresh_token_str: str) -> AuthenticationResult:
 		"""
 		Refresh an access token using a valid refresh token, implementing token rotation.
 
@@ -382,12 +520,10 @@ class AuthService:
 		"""
 		# --- Step 1: Decode the JWT refresh token ---
 		try:
-			payload = jwt.decode(
+			payload = _JWT.decode(
 				refresh_token_str,
-				settings.JWT_REFRESH_SECRET,  # Use REFRESH secret
-				algorithms=[settings.JWT_ALGORITHM],
-				audience=settings.JWT_AUDIENCE,
-				options={'verify_signature': True, 'verify_aud': True},
+				_JWT_REFRESH_SECRET_BYTES,  # Use REFRESH secret
+				**_JWT_DECODE_OPTIONS,
 			)
 
 			# Verify token type is 'refresh'
@@ -419,18 +555,22 @@ class AuthService:
 			)
 			raise RefreshTokenInvalidError('Invalid refresh token') from e
 
-		# --- Step 2: Find tokens for this user and verify the token hash ---
-		# Instead of looking for exact token, we need to find tokens for this user and verify hashes
-		statement = select(RefreshToken).where(RefreshToken.user_id == token_user_id)
-		user_tokens = self.db.exec(statement).all()
-
-		db_refresh_token = None
-		for token in user_tokens:
-			if self.verify_token_hash(refresh_token_str, token.token):
-				db_refresh_token = token
-				break
+		# --- Step 2: Look up the stored token by its hash, together with its user ---
+		# The HMAC is deterministic, so the unique index on token_hash finds the row directly.
+		# The token row stays locked until the rotation commits; a concurrent refresh with the
+		# same token skips it and finds nothing, so a token can only be rotated once.
+		statement = (
+			select(RefreshToken, User)
+			.join(User, User.id == RefreshToken.user_id)
+			.where(
+				RefreshToken.token_hash == self.token_digest(refresh_token_str),
+				RefreshToken.user_id == token_user_id,
+			)
+			.with_for_update(of=RefreshToken, skip_locked=True)
+		)
+		row = (await self.db.exec(statement)).first()
 
-		if not db_refresh_token:
+		if not row:
 			# If no matching token hash found
 			security_logger.log_token_validation(
 				'refresh',
@@ -440,48 +580,52 @@ class AuthService:
 			)
 			raise RefreshTokenInvalidError('Refresh token has been invalidated')
 
-		# Check token expiry in database as a secondary measure
+		db_refresh_token, user = row
+
+		# Check token expiry in database as a secondary measure. The same clock reading dates
+		# the rotated refresh token and the new access token below.
 		current_time = datetime_utcnow()
 		if db_refresh_token.expires_at < current_time:
-			self.db.delete(db_refresh_token)  # Clean up expired token
-			self.db.commit()
+			# Clean up the expired token with one DELETE, without a unit-of-work flush
+			await self.db.exec(
+				delete(RefreshToken)
+				.where(RefreshToken.id == db_refresh_token.id)
+				.execution_options(synchronize_session=False)
+			)
+			await self.db.commit()
 			security_logger.log_token_invalidation(
-				'refresh', user_id=str(token_user_id), details={'reason': 'db_expiry'}
+				'refresh', user_id=token_user_id_str, details={'reason': 'db_expiry'}
 			)
 			raise RefreshTokenExpiredError('Refresh token has expired according to database')
 
 		# Log successful DB validation
 		security_logger.log_token_validation(
-			'refresh', True, user_id=str(token_user_id), details={'validation': 'database'}
+			'refresh', True, user_id=token_user_id_str, details={'validation': 'database'}
 		)
 
 		user_id = db_refresh_token.user_id  # Use user_id confirmed from DB record
 
 		# --- Step 3: Refresh Token Rotation ---
-		# Delete the old token record from the database
-		self.db.delete(db_refresh_token)
-		# We must commit here to ensure the old token is invalidated
-		self.db.commit()
+		# Replace the old token record with a new one in a single transaction, so the old
+		# token is invalidated exactly when the new one becomes valid
+		await self.db.delete(db_refresh_token)
+		new_refresh_token = await self._add_refresh_token(user_id, now=current_time)
+		await self.db.commit()
 
 		security_logger.log_token_invalidation(
-			'refresh', user_id=str(user_id), details={'reason': 'rotation'}
+			'refresh', user_id=token_user_id_str, details={'reason': 'rotation'}
 		)
-
-		# Create a new refresh token (generates new JWT, saves new DB record)
-		new_refresh_token = self.create_refresh_token(user_id=user_id)
+		security_logger.log_token_creation('refresh', token_user_id_str)
 
 		# Create a new access token
-		new_access_token = self.create_access_token(subject=user_id)
-
-		# Get the user
-		user = self.db.get(User, user_id)
+		new_access_token = self.create_access_token(subject=user_id, now=current_time)
 
 		return AuthenticationResult(
 			access_token=new_access_token, refresh_token=new_refresh_token, user=user
 		)
 
 	# 5. Token Invalidation Methods
-	def invalidate_refresh_token(self, refresh_token_str: str) -> bool:
+	async def invalidate_refresh_token(self, refresh_token_str: str) -> bool:
 		"""
 		Invalidate a specific refresh token.
 
@@ -493,12 +637,10 @@ class AuthService:
 		"""
 		try:
 			# First decode the token to get the user ID
-			payload = jwt.decode(
+			payload = _JWT.decode(
 				refresh_token_str,
-				settings.JWT_REFRESH_SECRET,
-				algorithms=[settings.JWT_ALGORITHM],
-				audience=settings.JWT_AUDIENCE,
-				options={'verify_signature': True, 'verify_aud': True},
+				_JWT_REFRESH_SECRET_BYTES,
+				**_JWT_DECODE_OPTIONS,
 			)
 
 			user_id_str = payload.get('sub')
@@ -507,46 +649,58 @@ class AuthService:
 
 			user_id = uuid.UUID(user_id_str)
 
-			# Find tokens for this user and check hashes
-			statement = select(RefreshToken).where(RefreshToken.user_id == user_id)
-			user_tokens = self.db.exec(statement).all()
+			# Delete the stored token by its digest, through the unique index on token_hash
+			statement = delete(RefreshToken).where(
+				RefreshToken.token_hash == self.token_digest(refresh_token_str),
+				RefreshToken.user_id == user_id,
+			)
+			result = await self.db.exec(statement)
+			await self.db.commit()
 
-			for token in user_tokens:
-				if self.verify_token_hash(refresh_token_str, token.token):
-					self.db.delete(token)
-					self.db.commit()
-					security_logger.log_token_invalidation(
-						'refresh', user_id=user_id_str, details={'reason': 'manual_invalidation'}
-					)
-					return True
+			if not result.rowcount:
+				return False
 
-			return False
+			security_logger.log_token_invalidation(
+				'refresh', user_id=user_id_str, details={'reason': 'manual_invalidation'}
+			)
+			return True
 		except (jwt.InvalidTokenError, ValueError):
 			# If the token is invalid or expired, just return False
 			return False
 
-	def invalidate_all_refresh_tokens_for_user(self, user_id: uuid.UUID) -> int:
+	async def invalidate_all_refresh_tokens_for_user(self, user_id: uuid.UUID) -> int:
 		"""
 		Invalidate all refresh tokens for a specific user.
 
+		The tokens are removed with a single DELETE in the current transaction;
+		the caller is responsible for committing.
+
 		Args:
 			user_id: The user ID whose tokens should be invalidated
 
 		Returns:
 			The number of tokens that were invalidated
 		"""
-		statement = select(RefreshToken).where(RefreshToken.user_id == user_id)
-		tokens_to_delete = self.db.exec(statement).all()
-		count = 0
-		for token in tokens_to_delete:
-			self.db.delete(token)
-			count += 1
-		if count > 0:
-			self.db.commit()
-		return count
+		statement = delete(RefreshToken).where(RefreshToken.user_id == user_id)
+		result = await self.db.exec(statement)
+		return result.rowcount
+
+	async def delete_expired_refresh_tokens(self) -> int:
+		"""
+		Delete the refresh tokens of all users that are past their expiry.
+
+		Expired tokens are rejected anyway, this only keeps the table and its indexes small.
+
+		Returns:
+			The number of tokens that were deleted
+		"""
+		statement = delete(RefreshToken).where(RefreshToken.expires_at < datetime_utcnow())
+		result = await self.db.exec(statement)
+		await self.db.commit()
+		return result.rowcount
 
 	# 6. OTP Authentication Methods
-	def generate_auth_code(
+	async def generate_auth_code(
 		self, email: str, purpose: AuthCodePurpose = AuthCodePurpose.LOGIN
 	) -> str:
 		"""
@@ -563,8 +717,19 @@ class AuthService:
 			EmailNotRegisteredError: If no user is found with the provided email
 			TooManyRequestsError: If too many code requests have been made for this email
 		"""
-		# Check if this email is rate limited for code generation
-		is_limited, attempts_remaining = auth_rate_limiter.is_rate_limited(f'auth_code:{email}')
+		code, _ = await self._generate_auth_code(email, purpose)
+		return code
+
+	async def _generate_auth_code(self, email: str, purpose: AuthCodePurpose) -> tuple[str, User]:
+		"""
+		Implementation of generate_auth_code, also returning the user the code belongs to.
+
+		Raises:
+			EmailNotRegisteredError: If no user is found with the provided email
+			TooManyRequestsError: If too many code requests have been made for this email
+		"""
+		# Check the code generation rate limit and count this request
+		is_limited, attempts_remaining = auth_rate_limiter.check_and_record(f'auth_code:{email}')
 		if is_limited:
 			security_logger.log_rate_limit_hit(
 				email, 'AUTH_CODE_GENERATION', {'attempts_remaining': 0}
@@ -573,11 +738,9 @@ class AuthService:
 
 		# Find the user by email
 		statement = select(User).where(User.email == email)
-		user = self.db.exec(statement).first()
+		user = (await self.db.exec(statement)).first()
 
 		if not user:
-			# Record attempt for non-existent user (but don't reveal this to client)
-			auth_rate_limiter.record_attempt(f'auth_code:{email}')
 			security_logger.log_event(
 				'AUTH_CODE_GENERATION',
 				success=False,
@@ -585,11 +748,12 @@ class AuthService:
 			)
 			raise EmailNotRegisteredError('No user found with this email address.')
 
-		# Invalidate any existing unused auth codes for this user and purpose
-		self._invalidate_existing_auth_codes(user.id, purpose)
+		# Invalidate any existing unused auth codes for this user and purpose, committed
+		# together with the new code below
+		await self._invalidate_existing_auth_codes(user.id, purpose)
 
-		# Generate a random 6-digit code
-		code = ''.join(random.choices(string.digits, k=6))
+		# Generate a random 6-digit code from the OS CSPRNG
+		code = f'{secrets.randbelow(1_000_000):06d}'
 
 		# Hash the code before storing it in the database
 		code_hash = self.hash_token(code)
@@ -602,10 +766,7 @@ class AuthService:
 		)
 
 		self.db.add(auth_code)
-		self.db.commit()
-
-		# Record this request to rate limit future requests
-		auth_rate_limiter.record_attempt(f'auth_code:{email}')
+		await self.db.commit()
 
 		security_logger.log_event(
 			'AUTH_CODE_GENERATION',
@@ -613,49 +774,55 @@ class AuthService:
 			details={'user_id': str(user.id), 'purpose': purpose},
 		)
 
-		return code
+		return code, user
 
-	def _invalidate_existing_auth_codes(self, user_id: uuid.UUID, purpose: AuthCodePurpose) -> None:
+	async def _invalidate_existing_auth_codes(
+		self, user_id: uuid.UUID, purpose: AuthCodePurpose
+	) -> None:
 		"""
 		Invalidate all existing unused auth codes for a user with the specified purpose.
 
+		The codes are marked as used with a single UPDATE in the current transaction;
+		the caller is responsible for committing.
+
 		Args:
 			user_id: The user's ID
 			purpose: The purpose of the authentication codes to invalidate
 		"""
-		statement = select(AuthCode).where(
-			AuthCode.user_id == user_id,
-			AuthCode.purpose == purpose,
-			AuthCode.is_used == False,  # noqa: E712
+		statement = (
+			update(AuthCode)
+			.where(
+				AuthCode.user_id == user_id,
+				AuthCode.purpose == purpose,
+				AuthCode.is_used == False,  # noqa: E712
+			)
+			.values(is_used=True)
 		)
+		await self.db.exec(statement)
 
-		existing_codes = self.db.exec(statement).all()
-		for code in existing_codes:
-			code.is_used = True
-
-		if existing_codes:
-			self.db.commit()
-
-	def send_auth_code_email(
-		self, email: str, purpose: AuthCodePurpose = AuthCodePurpose.LOGIN
+	async def send_auth_code_email(
+		self,
+		email: str,
+		purpose: AuthCodePurpose = AuthCodePurpose.LOGIN,
+		background_tasks: BackgroundTasks | None = None,
 	) -> bool:
 		"""
 		Generate an authentication code and send it via email.
 
+		With background_tasks, the SMTP delivery is queued to run after the response has
+		been sent, and only code generation and loading the SMTP settings happen inline.
+
 		Args:
 			email: The email address to send the code to
 			purpose: The purpose of the authentication code
+			background_tasks: Optional tasks of the current request to queue the send on
 
 		Returns:
-			True if the email was sent successfully, False otherwise
+			True if the email was sent (or queued) successfully, False otherwise
 		"""
 		try:
-			# Generate a new code
-			code = self.generate_auth_code(email, purpose)
-
-			# Get user for personalization
-			statement = select(User).where(User.email == email)
-			user = self.db.exec(statement).first()
+			# Generate a new code, along with the user for personalization
+			code, user = await self._generate_auth_code(email, purpose)
 
 			# Generate email content based on purpose
 			subject = 'Your llmezi authentication code'
@@ -671,32 +838,24 @@ class AuthService:
 					expires_minutes=settings.AUTH_CODE_EXPIRE_MINUTES,
 				)
 
-			# Send the email
-			success = self.email_service.send_email(
-				to_email=email,
-				subject=subject,
-				html_content=html_content,
-				text_content=text_content,
-			)
-
-			if success:
-				security_logger.log_event(
-					'AUTH_CODE_EMAIL_SENT',
-					success=True,
-					details={'user_id': str(user.id), 'purpose': purpose},
-				)
-			else:
-				security_logger.log_event(
-					'AUTH_CODE_EMAIL_SENT',
-					success=False,
-					details={
-						'user_id': str(user.id),
-						'purpose': purpose,
-						'reason': 'email_send_failed',
-					},
+			# Load the SMTP settings while the database session is still available
+			await self.email_service.refresh_credentials()
+
+			if background_tasks is not None and self.email_service.is_configured():
+				background_tasks.add_task(
+					self._send_auth_code_message,
+					user.id,
+					email,
+					purpose,
+					subject,
+					html_content,
+					text_content,
 				)
+				return True
 
-			return success
+			return await self._send_auth_code_message(
+				user.id, email, purpose, subject, html_content, text_content
+			)
 
 		except (EmailNotRegisteredError, TooManyRequestsError) as e:
 			# Don't reveal to the client whether the email exists or not for security
@@ -706,7 +865,50 @@ class AuthService:
 			# Re-raise the exception for the API layer to handle
 			raise
 
-	def verify_auth_code(
+	async def _send_auth_code_message(
+		self,
+		user_id: uuid.UUID,
+		email: str,
+		purpose: AuthCodePurpose,
+		subject: str,
+		html_content: str,
+		text_content: str,
+	) -> bool:
+		"""
+		Send a prepared auth code email and log the outcome.
+
+		Only uses the already loaded SMTP settings, never the database session.
+
+		Returns:
+			True if the email was sent successfully, False otherwise
+		"""
+		success = await self.email_service.send_email(
+			to_email=email,
+			subject=subject,
+			html_content=html_content,
+			text_content=text_content,
+		)
+
+		if success:
+			security_logger.log_event(
+				'AUTH_CODE_EMAIL_SENT',
+				success=True,
+				details={'user_id': str(user_id), 'purpose': purpose},
+			)
+		else:
+			security_logger.log_event(
+				'AUTH_CODE_EMAIL_SENT',
+				success=False,
+				details={
+					'user_id': str(user_id),
+					'purpose': purpose,
+					'reason': 'email_send_failed',
+				},
+			)
+
+		return success
+
+	async def verify_auth_code(
 		self, email: str, code: str, purpose: AuthCodePurpose = AuthCodePurpose.LOGIN
 	) -> User:
 		"""
@@ -725,47 +927,36 @@ class AuthService:
 			AuthCodeExpiredError: If the code has expired
 			AuthCodeUsedError: If the code has already been used
 		"""
-		# Find the user by email
-		statement = select(User).where(User.email == email)
-		user = self.db.exec(statement).first()
-
-		if not user:
-			security_logger.log_event(
-				'AUTH_CODE_VERIFICATION',
-				success=False,
-				details={'reason': 'user_not_found', 'email': email},
+		# Fetch the user and their unused code in one query. The HMAC is deterministic, so
+		# the code is matched by its hash through the partial index on active codes.
+		statement = (
+			select(User, AuthCode)
+			.join(AuthCode, AuthCode.user_id == User.id)
+			.where(
+				User.email == email,
+				AuthCode.code == self.hash_token(code),
+				AuthCode.purpose == purpose,
+				AuthCode.is_used == False,  # noqa: E712
 			)
-			raise AuthCodeInvalidError('Invalid authentication code.')
-
-		# Find all auth codes for this user and purpose
-		statement = select(AuthCode).where(
-			AuthCode.user_id == user.id,
-			AuthCode.purpose == purpose,
-			AuthCode.is_used == False,  # noqa: E712
 		)
+		row = (await self.db.exec(statement)).first()
 
-		auth_codes = self.db.exec(statement).all()
-
-		# Use constant-time comparison through our hash verification
-		matching_code = None
-		for auth_code in auth_codes:
-			if self.verify_token_hash(code, auth_code.code):
-				matching_code = auth_code
-				break
-
-		if not matching_code:
+		if not row:
+			# Either the email is unknown or it has no such unused code
 			security_logger.log_event(
 				'AUTH_CODE_VERIFICATION',
 				success=False,
-				details={'reason': 'code_not_found', 'user_id': str(user.id)},
+				details={'reason': 'code_not_found', 'email': email},
 			)
 			raise AuthCodeInvalidError('Invalid authentication code.')
 
+		user, matching_code = row
+
 		# Check if the code has expired
 		current_time = datetime_utcnow()
 		if matching_code.expires_at < current_time:
 			matching_code.is_used = True
-			self.db.commit()
+			await self.db.commit()
 
 			security_logger.log_event(
 				'AUTH_CODE_VERIFICATION',
@@ -777,18 +968,14 @@ class AuthService:
 		# Mark the code as used
 		matching_code.is_used = True
 
-		# Clean up all other auth codes for this user and purpose
-		# Find all auth codes for this user and purpose (including used ones)
-		cleanup_statement = select(AuthCode).where(
-			AuthCode.user_id == user.id, AuthCode.purpose == purpose
+		# Clean up all other auth codes for this user and purpose (including used ones)
+		# with a single DELETE, keeping the matching code marked as used
+		cleanup_statement = delete(AuthCode).where(
+			AuthCode.user_id == user.id,
+			AuthCode.purpose == purpose,
+			AuthCode.id != matching_code.id,
 		)
-
-		all_auth_codes = self.db.exec(cleanup_statement).all()
-
-		# Delete all auth codes except the one we just used
-		for auth_code in all_auth_codes:
-			if auth_code.id != matching_code.id:  # Keep the matching code marked as used
-				self.db.delete(auth_code)
+		cleanup_result = await self.db.exec(cleanup_statement)
 
 		security_logger.log_event(
 			'AUTH_CODE_CLEANUP',
@@ -796,11 +983,11 @@ class AuthService:
 			details={
 				'user_id': str(user.id),
 				'purpose': purpose,
-				'deleted_codes': len(all_auth_codes) - 1,  # Subtract the matching code
+				'deleted_codes': cleanup_result.rowcount,
 			},
 		)
 
-		self.db.commit()
+		await self.db.commit()
 
 		security_logger.log_event(
 			'AUTH_CODE_VERIFICATION',
@@ -810,7 +997,7 @@ class AuthService:
 
 		return user
 
-	def authenticate_with_auth_code(self, email: str, code: str) -> AuthenticationResult:
+	async def authenticate_with_auth_code(self, email: str, code: str) -> AuthenticationResult:
 		"""
 		Authenticate a user with an email and authentication code.
 
@@ -827,11 +1014,11 @@ class AuthService:
 			AuthCodeUsedError: If the code has already been used
 		"""
 		# Verify the authentication code
-		user = self.verify_auth_code(email, code)
+		user = await self.verify_auth_code(email, code)
 
 		# Generate tokens
 		access_token = self.create_access_token(subject=user.id)
-		refresh_token = self.create_refresh_token(user_id=user.id)
+		refresh_token = await self.create_refresh_token(user_id=user.id)
 
 		security_logger.log_event(
 			'AUTH_CODE_LOGIN', success=True, details={'user_id': str(user.id)}
@@ -1,25 +1,65 @@
 import base64
-from typing import List, Optional
+import os
+from dataclasses import dataclass
+from functools import cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from sqlmodel import Session, select
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.models.credential import Credential
-from app.utils.datetime import datetime_utcnow
+from app.utils.datetime import UTCNOW_SQL
+
+# Marks values encrypted with AES-GCM, values without it are legacy AES-CBC ciphertexts.
+# ':' is outside the urlsafe base64 alphabet, so the two formats cannot be confused.
+_GCM_PREFIX = 'gcm:'
+_GCM_NONCE_SIZE = 12
+
+
+def _build_ciphers(key: bytes, iv: bytes) -> Tuple[AESGCM, Cipher]:
+	"""Build the AES-GCM cipher and the legacy AES-CBC cipher (for reading old values)."""
+	return AESGCM(key), Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+
+
+@cache
+def _configured_ciphers() -> Tuple[bytes, bytes, AESGCM, Cipher]:
+	"""
+	Decode the configured key and IV and build their ciphers, once per process.
+
+	Done on first use rather than at import, so a missing or malformed CREDS_KEY only
+	fails the code that needs credentials.
+	"""
+	key = base64.urlsafe_b64decode(settings.CREDS_KEY)
+	iv = base64.urlsafe_b64decode(settings.CREDS_IV)
+	return key, iv, *_build_ciphers(key, iv)
+
+
+@dataclass(slots=True)
+class CredentialUpdate:
+	"""A single credential write for CredentialService.set_credentials_bulk."""
+
+	key: str
+	value: str
+	should_encrypt: bool = False
+	description: Optional[str] = None
 
 
 class CredentialService:
 	"""
 	Service for managing credentials, including:
-	- Encrypting and decrypting sensitive data using AES encryption
+	- Encrypting and decrypting sensitive data using AES-GCM encryption
 	- Database operations for storing and retrieving credentials
 	"""
 
 	def __init__(
-		self, db: Optional[Session] = None, key: Optional[str] = None, iv: Optional[str] = None
+		self, db: Optional[AsyncSession] = None, key: Optional[str] = None, iv: Optional[str] = None
 	):
 		"""
 		Initialize the credential service with encryption key and initialization vector.
@@ -28,49 +68,47 @@ class CredentialService:
 		    db: The database session to use for database operations
 		    key: Base64 encoded string for the encryption key.
 		         Defaults to settings.CREDS_KEY if not provided.
-		    iv: Base64 encoded string for the initialization vector.
+		    iv: Base64 encoded string for the initialization vector of legacy AES-CBC values.
 		        Defaults to settings.CREDS_IV if not provided.
 		"""
 		self.db = db
-		self.key = base64.urlsafe_b64decode(key or settings.CREDS_KEY)
-		self.iv = base64.urlsafe_b64decode(iv or settings.CREDS_IV)
+		# The AES key schedule is run when the ciphers are built, not on every encrypt/decrypt.
+		# The legacy AES-CBC cipher is only used to read values stored before AES-GCM.
+		if not key and not iv:
+			# A service is built per request, the configured key needs decoding only once
+			self.key, self.iv, self._aead, self._legacy_cipher = _configured_ciphers()
+		else:
+			self.key = base64.urlsafe_b64decode(key or settings.CREDS_KEY)
+			self.iv = base64.urlsafe_b64decode(iv or settings.CREDS_IV)
+			self._aead, self._legacy_cipher = _build_ciphers(self.key, self.iv)
 
 	def encrypt(self, plain_text: str) -> str:
 		"""
-		Encrypt a string value using AES encryption.
+		Encrypt a string value using AES-GCM with a random nonce.
 
 		Args:
 		    plain_text: The string to encrypt
 
 		Returns:
-		    Base64 encoded encrypted string
+		    Base64 encoded nonce and ciphertext, prefixed with the format marker
 		"""
 		if not plain_text:
 			return ''
 
-		# Convert string to bytes
-		plain_bytes = plain_text.encode('utf-8')
-
-		# Add padding to ensure the data is a multiple of the block size
-		padder = padding.PKCS7(algorithms.AES.block_size).padder()
-		padded_data = padder.update(plain_bytes) + padder.finalize()
-
-		# Create encryptor
-		cipher = Cipher(algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend())
-		encryptor = cipher.encryptor()
-
-		# Encrypt the data
-		encrypted_bytes = encryptor.update(padded_data) + encryptor.finalize()
+		nonce = os.urandom(_GCM_NONCE_SIZE)
+		encrypted_bytes = self._aead.encrypt(nonce, plain_text.encode('utf-8'), None)
 
 		# Encode as base64 for storage/transmission
-		return base64.urlsafe_b64encode(encrypted_bytes).decode('utf-8')
+		return _GCM_PREFIX + base64.urlsafe_b64encode(nonce + encrypted_bytes).decode('utf-8')
 
 	def decrypt(self, encrypted_text: str) -> str:
 		"""
 		Decrypt an encrypted string value.
 
+		Values written before the switch to AES-GCM are decrypted with AES-CBC.
+
 		Args:
-		    encrypted_text: Base64 encoded encrypted string
+		    encrypted_text: Encrypted string as returned by encrypt
 
 		Returns:
 		    The decrypted string
@@ -78,26 +116,28 @@ class CredentialService:
 		if not encrypted_text:
 			return ''
 
-		# Decode from base64
-		encrypted_bytes = base64.urlsafe_b64decode(encrypted_text)
+		if encrypted_text.startswith(_GCM_PREFIX):
+			data = base64.urlsafe_b64decode(encrypted_text[len(_GCM_PREFIX) :])
+			nonce, encrypted_bytes = data[:_GCM_NONCE_SIZE], data[_GCM_NONCE_SIZE:]
+			return self._aead.decrypt(nonce, encrypted_bytes, None).decode('utf-8')
+
+		return self._decrypt_legacy(encrypted_text)
 
-		# Create decryptor
-		cipher = Cipher(algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend())
-		decryptor = cipher.decryptor()
+	def _decrypt_legacy(self, encrypted_text: str) -> str:
+		"""Decrypt a value stored with the former AES-CBC and PKCS7 scheme."""
+		encrypted_bytes = base64.urlsafe_b64decode(encrypted_text)
 
-		# Decrypt the data
+		decryptor = self._legacy_cipher.decryptor()
 		decrypted_padded_bytes = decryptor.update(encrypted_bytes) + decryptor.finalize()
 
-		# Remove padding
 		unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
 		decrypted_bytes = unpadder.update(decrypted_padded_bytes) + unpadder.finalize()
 
-		# Convert bytes back to string
 		return decrypted_bytes.decode('utf-8')
 
 	# Database operations
 
-	def get_credential(self, key: str) -> Optional[Credential]:
+	async def get_credential(self, key: str) -> Optional[Credential]:
 		"""
 		Get a credential by its key.
 
@@ -111,11 +151,11 @@ class CredentialService:
 			raise ValueError('Database session is required for this operation')
 
 		statement = select(Credential).where(Credential.key == key)
-		credential = self.db.exec(statement).first()
+		credential = (await self.db.exec(statement)).first()
 
 		return credential
 
-	def get_credential_value(self, key: str) -> Optional[str]:
+	async def get_credential_value(self, key: str) -> Optional[str]:
 		"""
 		Get the value of a credential by its key.
 		If the credential is encrypted, it will be decrypted before returning.
@@ -129,22 +169,51 @@ class CredentialService:
 		if not self.db:
 			raise ValueError('Database session is required for this operation')
 
-		credential = self.get_credential(key)
+		# Only the two columns needed are selected, no Credential object is built
+		statement = select(Credential.value, Credential.is_value_encrypted).where(
+			Credential.key == key
+		)
+		row = (await self.db.exec(statement)).first()
 
-		if credential:
-			value = credential.value
-			if credential.is_value_encrypted:
-				value = self.decrypt(value)
-			return value
+		if row is None:
+			return None
+
+		value, is_value_encrypted = row
+		return self.decrypt(value) if is_value_encrypted else value
 
-		return None
+	async def get_credential_values(self, keys: Iterable[str]) -> Dict[str, str]:
+		"""
+		Get the values of several credentials in a single query.
+		Encrypted values are decrypted before returning.
+
+		Args:
+		    keys: The keys of the credentials to retrieve
 
-	def set_credential(
+		Returns:
+		    A dict from key to value, keys without a stored credential are left out
+		"""
+		if not self.db:
+			raise ValueError('Database session is required for this operation')
+
+		statement = select(Credential.key, Credential.value, Credential.is_value_encrypted).where(
+			Credential.key.in_(list(keys))
+		)
+		rows = (await self.db.exec(statement)).all()
+
+		return {
+			key: self.decrypt(value) if is_value_encrypted else value
+			for key, value, is_value_encrypted in rows
+		}
+
+	async def set_credential(
 		self, key: str, value: str, should_encrypt: bool = False, description: Optional[str] = None
 	) -> Credential:
 		"""
 		Create or update a credential.
 
+		The returned object is complete without a refresh: server-set timestamps come back
+		through RETURNING and the session keeps attributes loaded after commit.
+
 		Args:
 		    key: The key of the credential
 		    value: The value to store
@@ -162,19 +231,17 @@ class CredentialService:
 			stored_value = self.encrypt(value)
 
 		# Check if credential with this key already exists
-		existing_credential = self.get_credential(key)
+		existing_credential = await self.get_credential(key)
 
 		if existing_credential:
 			# Update the existing credential
 			existing_credential.value = stored_value
 			existing_credential.is_value_encrypted = should_encrypt
-			existing_credential.updated_at = datetime_utcnow()
 			if description is not None:
 				existing_credential.description = description
 
 			self.db.add(existing_credential)
-			self.db.commit()
-			self.db.refresh(existing_credential)
+			await self.db.commit()
 			return existing_credential
 		else:
 			# Create a new credential
@@ -186,11 +253,53 @@ class CredentialService:
 			)
 
 			self.db.add(credential)
-			self.db.commit()
-			self.db.refresh(credential)
+			await self.db.commit()
 			return credential
 
-	def delete_credential(self, key: str) -> bool:
+	async def set_credentials_bulk(self, items: List[CredentialUpdate]) -> None:
+		"""
+		Create or update several credentials in a single statement and transaction.
+
+		Issues one INSERT ... ON CONFLICT (key) DO UPDATE for all items. As with
+		set_credential, a description of None keeps the stored description.
+
+		Args:
+		    items: The credentials to write
+		"""
+		if not self.db:
+			raise ValueError('Database session is required for this operation')
+
+		if not items:
+			return
+
+		rows = [
+			Credential(
+				key=item.key,
+				value=self.encrypt(item.value) if item.should_encrypt else item.value,
+				is_value_encrypted=item.should_encrypt,
+				description=item.description,
+			).model_dump()
+			for item in items
+		]
+
+		statement = insert(Credential).values(rows)
+		statement = statement.on_conflict_do_update(
+			index_elements=[Credential.key],
+			set_={
+				'value': statement.excluded.value,
+				'is_value_encrypted': statement.excluded.is_value_encrypted,
+				# Column onupdate defaults do not apply to ON CONFLICT DO UPDATE
+				'updated_at': UTCNOW_SQL,
+				'description': func.coalesce(
+					statement.excluded.description, Credential.description
+				),
+			},
+		)
+
+		await self.db.exec(statement)
+		await self.db.commit()
+
+	async def delete_credential(self, key: str) -> bool:
 		"""
 		Delete a credential by its key.
 
@@ -203,16 +312,16 @@ class CredentialService:
 		if not self.db:
 			raise ValueError('Database session is required for this operation')
 
-		credential = self.get_credential(key)
+		credential = await self.get_credential(key)
 
 		if credential:
-			self.db.delete(credential)
-			self.db.commit()
+			await self.db.delete(credential)
+			await self.db.commit()
 			return True
 
 		return False
 
-	def list_credentials(self, include_values: bool = False) -> List[dict]:
+	async def list_credentials(self, include_values: bool = False) -> List[dict]:
 		"""
 		List all credentials.
 
@@ -225,26 +334,35 @@ class CredentialService:
 		if not self.db:
 			raise ValueError('Database session is required for this operation')
 
-		statement = select(Credential)
-		credentials = self.db.exec(statement).all()
-
-		result = []
-		for cred in credentials:
-			cred_dict = {
-				'id': str(cred.id),
-				'key': cred.key,
-				'is_value_encrypted': cred.is_value_encrypted,
-				'created_at': cred.created_at,
-				'updated_at': cred.updated_at,
-				'description': cred.description,
+		# Only load the columns that are returned, the stored values are skipped unless asked for
+		columns = [
+			Credential.id,
+			Credential.key,
+			Credential.is_value_encrypted,
+			Credential.created_at,
+			Credential.updated_at,
+			Credential.description,
+		]
+		if include_values:
+			columns.append(Credential.value)
+		rows = (await self.db.exec(select(*columns))).all()
+
+		result = [
+			{
+				'id': str(row.id),
+				'key': row.key,
+				'is_value_encrypted': row.is_value_encrypted,
+				'created_at': row.created_at,
+				'updated_at': row.updated_at,
+				'description': row.description,
 			}
-
-			if include_values:
-				value = cred.value
-				if cred.is_value_encrypted:
-					value = self.decrypt(value)
-				cred_dict['value'] = value
-
-			result.append(cred_dict)
+			for row in rows
+		]
+
+		if include_values:
+			# Plain values are copied as is, only encrypted ones go through decrypt
+			decrypt = self.decrypt
+			for cred_dict, row in zip(result, rows):
+				cred_dict['value'] = decrypt(row.value) if row.is_value_encrypted else row.value
 
 		return result
@@ -1,16 +1,280 @@
 import logging
+import re
 import smtplib
 import ssl
+import threading
+import time
+from dataclasses import dataclass
+from email.header import Header
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Dict, List, Optional
+from email.policy import compat32
+from email.utils import parseaddr
+from functools import cache
+from typing import Dict, List, Optional, Tuple
 
-from sqlmodel import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.services.credential_service import CredentialService
+from app.utils.email_templates import html_to_text
 
 logger = logging.getLogger(__name__)
 
+# Credentials that configure the email service, loaded together in one query
+_SMTP_CREDENTIAL_KEYS = (
+	'SMTP_HOST',
+	'SMTP_PORT',
+	'SMTP_USER',
+	'SMTP_PASSWORD',
+	'SMTP_TLS',
+	'SMTP_SSL',
+	'EMAILS_FROM_EMAIL',
+	'EMAILS_FROM_NAME',
+)
+
+# Idle, logged in SMTP connections kept between sends, keyed by the settings they were
+# opened with. Sends run in the threadpool, so the pool is shared behind a lock and each
+# connection is only ever used by the thread that took it out.
+_SMTP_POOL: Dict[tuple, List[Tuple[smtplib.SMTP, float]]] = {}
+_SMTP_POOL_LOCK = threading.Lock()
+_SMTP_POOL_MAX_IDLE = 2
+# Servers drop idle clients after a few minutes, older connections are not worth a NOOP
+_SMTP_POOL_IDLE_SECONDS = 60.0
+
+# Replies that mean "try again later" (RFC 5321 4xx), retried by send_bulk with backoff
+_TRANSIENT_SMTP_CODES = frozenset({421, 450, 451, 452, 454})
+_BULK_SEND_RETRIES = 2
+_BULK_RETRY_BACKOFF_SECONDS = 1.0
+# Recipients per transaction when send_bulk groups by domain, RFC 5321 requires servers to
+# accept at least 100 RCPT commands per message
+_BULK_GROUP_MAX_RECIPIENTS = 100
+# To header of a message delivered to a group, which must not list the other recipients
+_UNDISCLOSED_TO_HEADER = b'To: undisclosed-recipients:;\r\n'
+
+_CRLF = b'\r\n'
+# Messages are serialized straight to the bytes sent on the wire, with SMTP line endings
+_WIRE_POLICY = compat32.clone(linesep='\r\n')
+_LINE_ENDINGS = re.compile(rb'\r\n|\n|\r')
+_LEADING_PERIODS = re.compile(rb'(?m)^\.')
+
+
+class _PipeliningMixin:
+	"""
+	Sends a message's MAIL, RCPT and DATA commands in one write when the server advertises
+	PIPELINING (RFC 2920).
+
+	smtplib waits for the reply to each command before sending the next, so every message
+	costs two round trips plus one per recipient before its content is sent. Pipelined,
+	that is a single round trip. Replies are checked like smtplib.SMTP.sendmail does and
+	raise the same exceptions.
+
+	Connections also record what EmailService needs to decide whether a message can be
+	resent after the server disconnects, see EmailService._sendmail.
+	"""
+
+	# Whether the connection was in use before the current send: taken from the pool or
+	# used for an earlier message. Set by EmailService.
+	reused = False
+	# Whether the content of the current message may have reached the server
+	content_sent = False
+
+	def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+		self.content_sent = False
+		self.ehlo_or_helo_if_needed()
+		if not self.has_extn('pipelining') or mail_options or rcpt_options:
+			return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+		if isinstance(msg, str):
+			msg = _LINE_ENDINGS.sub(_CRLF, msg.encode('ascii'))
+		if isinstance(to_addrs, str):
+			to_addrs = [to_addrs]
+
+		mail_command = f'MAIL FROM:{smtplib.quoteaddr(from_addr)}'
+		if self.has_extn('size'):
+			mail_command += f' size={len(msg)}'
+		commands = [mail_command]
+		commands.extend(f'RCPT TO:{smtplib.quoteaddr(addr)}' for addr in to_addrs)
+		commands.append('DATA')
+		self.send(''.join(f'{command}\r\n' for command in commands))
+
+		mail_code, mail_response = self.getreply()
+		if mail_code == 421:
+			self.close()
+			raise smtplib.SMTPSenderRefused(mail_code, mail_response, from_addr)
+
+		refused = {}
+		for addr in to_addrs:
+			code, response = self.getreply()
+			if code not in (250, 251):
+				refused[addr] = (code, response)
+			if code == 421:
+				self.close()
+				raise smtplib.SMTPRecipientsRefused(refused)
+
+		data_code, data_response = self.getreply()
+		if mail_code != 250 or len(refused) == len(to_addrs):
+			# Servers reject DATA without an accepted recipient; should one accept it anyway,
+			# end the empty transaction before resetting
+			if data_code == 354:
+				self.send(b'.' + _CRLF)
+				self.getreply()
+			self._reset_transaction()
+			if mail_code != 250:
+				raise smtplib.SMTPSenderRefused(mail_code, mail_response, from_addr)
+			raise smtplib.SMTPRecipientsRefused(refused)
+
+		if data_code != 354:
+			self._abort_transaction(data_code)
+			raise smtplib.SMTPDataError(data_code, data_response)
+
+		content = _LEADING_PERIODS.sub(b'..', msg)
+		if not content.endswith(_CRLF):
+			content += _CRLF
+		self.content_sent = True
+		self.send(content + b'.' + _CRLF)
+
+		code, response = self.getreply()
+		if code != 250:
+			self._abort_transaction(code)
+			raise smtplib.SMTPDataError(code, response)
+
+		return refused
+
+	def _reset_transaction(self) -> None:
+		"""Send RSET, ignoring a server that has already disconnected."""
+		try:
+			self.rset()
+		except smtplib.SMTPServerDisconnected:
+			pass
+
+	def data(self, msg):
+		# Used by smtplib's own sendmail when not pipelining. The content follows the reply
+		# to DATA, so it counts as sent from here on.
+		self.content_sent = True
+		return super().data(msg)
+
+	def _abort_transaction(self, code: int) -> None:
+		"""Clean up after a failed transaction, 421 means the server is closing the connection."""
+		if code == 421:
+			self.close()
+		else:
+			self._reset_transaction()
+
+
+class _PipeliningSMTP(_PipeliningMixin, smtplib.SMTP):
+	pass
+
+
+class _PipeliningSMTPSSL(_PipeliningMixin, smtplib.SMTP_SSL):
+	pass
+
+
+def _is_transient_smtp_error(error: Exception) -> bool:
+	"""Whether an SMTP error is a temporary failure worth retrying."""
+	if isinstance(error, smtplib.SMTPRecipientsRefused):
+		return bool(error.recipients) and all(
+			code in _TRANSIENT_SMTP_CODES for code, _ in error.recipients.values()
+		)
+	return (
+		isinstance(error, smtplib.SMTPResponseException)
+		and error.smtp_code in _TRANSIENT_SMTP_CODES
+	)
+
+
+@cache
+def _ssl_context() -> ssl.SSLContext:
+	"""
+	The TLS context for SMTP connections, shared by all of them.
+
+	Creating one loads the system CA certificates, which is worth doing only once. Contexts
+	are safe to share between threads, and it is created on first use rather than at import.
+	"""
+	return ssl.create_default_context()
+
+
+def _close_smtp_connection(server: smtplib.SMTP) -> None:
+	"""Close an SMTP connection, ignoring errors from a connection that is already gone."""
+	try:
+		server.quit()
+	except Exception:
+		server.close()
+
+
+def close_smtp_connections() -> None:
+	"""Close all pooled SMTP connections. Called on application shutdown."""
+	with _SMTP_POOL_LOCK:
+		idle = [server for connections in _SMTP_POOL.values() for server, _ in connections]
+		_SMTP_POOL.clear()
+
+	for server in idle:
+		_close_smtp_connection(server)
+
+
+@dataclass(slots=True)
+class OutgoingEmail:
+	"""A single message for EmailService.send_bulk, with the same fields as send_email."""
+
+	to_email: str
+	subject: str
+	html_content: str
+	text_content: Optional[str] = None
+	cc: Optional[List[str]] = None
+	bcc: Optional[List[str]] = None
+	reply_to: Optional[str] = None
+	attachments: Optional[Dict] = None
+
+
+def _to_header(to_email: str) -> bytes:
+	"""Serialize the To header line of a message, RFC 2047 encoded if needed."""
+	value = Header(to_email, header_name='To').encode(linesep='\r\n')
+	return b'To: ' + value.encode('ascii') + _CRLF
+
+
+def _recipients(email: OutgoingEmail) -> List[str]:
+	"""Envelope recipients of an email: its To, CC and BCC addresses."""
+	recipients = [email.to_email]
+	if email.cc:
+		recipients.extend(email.cc)
+	if email.bcc:
+		recipients.extend(email.bcc)
+	return recipients
+
+
+def _body_key(email: OutgoingEmail) -> tuple:
+	"""Everything that determines an email's message apart from its To header."""
+	return (
+		email.subject,
+		email.html_content,
+		email.text_content,
+		tuple(email.cc) if email.cc else None,
+		email.reply_to,
+		tuple(email.attachments.items()) if email.attachments else None,
+	)
+
+
+def _domain(address: str) -> str:
+	"""Lowercased domain of an email address."""
+	return parseaddr(address)[1].rpartition('@')[2].lower()
+
+
+@dataclass(slots=True)
+class _BulkTransaction:
+	"""One SMTP transaction of send_bulk: a message body and the emails it delivers."""
+
+	indexes: List[int]
+	body: bytes
+	recipients: List[str]
+
+
+@dataclass(slots=True)
+class BulkSendResult:
+	"""Outcome of one email sent with EmailService.send_bulk."""
+
+	to_email: str
+	success: bool
+	error: Optional[str] = None
+
 
 class EmailService:
 	"""
@@ -22,11 +286,15 @@ class EmailService:
 	- Managing email templates
 
 	This service retrieves SMTP configuration exclusively from the database using the CredentialService.
+	SMTP network I/O runs in the threadpool so it never blocks the event loop, and logged in
+	connections are pooled across instances so consecutive sends skip the handshake.
 	"""
 
-	def __init__(self, db: Session):
+	def __init__(self, db: AsyncSession):
 		"""
-		Initialize the Email Service with configuration from credentials in database.
+		Initialize the Email Service with default configuration.
+
+		Credentials are loaded from the database by awaiting refresh_credentials().
 
 		Args:
 		    db: Database session for retrieving credentials (required).
@@ -49,45 +317,54 @@ class EmailService:
 		self._use_ssl = False
 		self._from_email = None
 		self._from_name = None
+		# Derived from the settings above whenever credentials are loaded
+		self._from_header: Optional[str] = None
+		# Whether the required settings are present, updated whenever credentials are loaded
+		self._configured = False
 
-		# Load credentials from database
-		self._load_credentials_from_db()
-
-	def _load_credentials_from_db(self):
+	async def _load_credentials_from_db(self):
 		"""Load email configuration from credentials stored in the database."""
-		# Get each credential with the same keys as previously used
-		host = self.credential_service.get_credential_value('SMTP_HOST')
+		values = await self.credential_service.get_credential_values(_SMTP_CREDENTIAL_KEYS)
+
+		host = values.get('SMTP_HOST')
 		if host:
 			self._host = host
 
-		port_str = self.credential_service.get_credential_value('SMTP_PORT')
+		port_str = values.get('SMTP_PORT')
 		if port_str and port_str.isdigit():
 			self._port = int(port_str)
 
-		username = self.credential_service.get_credential_value('SMTP_USER')
+		username = values.get('SMTP_USER')
 		if username:
 			self._username = username
 
-		password = self.credential_service.get_credential_value('SMTP_PASSWORD')
+		password = values.get('SMTP_PASSWORD')
 		if password:
 			self._password = password
 
-		tls_str = self.credential_service.get_credential_value('SMTP_TLS')
+		tls_str = values.get('SMTP_TLS')
 		if tls_str:
 			self._use_tls = tls_str.lower() in ('true', '1', 'yes')
 
-		ssl_str = self.credential_service.get_credential_value('SMTP_SSL')
+		ssl_str = values.get('SMTP_SSL')
 		if ssl_str:
 			self._use_ssl = ssl_str.lower() in ('true', '1', 'yes')
 
-		from_email = self.credential_service.get_credential_value('EMAILS_FROM_EMAIL')
+		from_email = values.get('EMAILS_FROM_EMAIL')
 		if from_email:
 			self._from_email = from_email
 
-		from_name = self.credential_service.get_credential_value('EMAILS_FROM_NAME')
+		from_name = values.get('EMAILS_FROM_NAME')
 		if from_name:
 			self._from_name = from_name
 
+		self._from_header = (
+			f'{self._from_name} <{self._from_email}>' if self._from_name else self._from_email
+		)
+		self._configured = bool(
+			self._host and self._port and self._username and self._password and self._from_email
+		)
+
 	@property
 	def host(self) -> Optional[str]:
 		return self._host
@@ -120,20 +397,22 @@ class EmailService:
 	def from_name(self) -> Optional[str]:
 		return self._from_name
 
-	def refresh_credentials(self):
+	async def refresh_credentials(self):
 		"""Reload credentials from the database."""
-		self._load_credentials_from_db()
+		await self._load_credentials_from_db()
 
 	def is_configured(self) -> bool:
 		"""
 		Check if the email service has the required configuration.
 
+		The result is worked out when credentials are loaded, not on every call.
+
 		Returns:
 		    bool: True if all required SMTP settings are configured, False otherwise.
 		"""
-		return bool(self.host and self.port and self.username and self.password and self.from_email)
+		return self._configured
 
-	def check_smtp_connection(self) -> bool:
+	async def check_smtp_connection(self) -> bool:
 		"""
 		Test the SMTP connection by attempting to connect to the server.
 
@@ -143,40 +422,21 @@ class EmailService:
 		Returns:
 		    bool: True if connection is successful, False otherwise.
 		"""
+		return await run_in_threadpool(self._check_smtp_connection)
+
+	def _check_smtp_connection(self) -> bool:
+		"""
+		Blocking implementation of check_smtp_connection.
+
+		Always opens a fresh connection. Once it is logged in, it is handed to the connection
+		pool instead of being closed, so a send right after a check reuses it.
+		"""
 		if not self.is_configured():
 			logger.warning('SMTP is not fully configured - cannot check connection')
 			return False
 
 		try:
-			if self.use_ssl:
-				# For SSL connections (usually port 465)
-				context = ssl.create_default_context()
-				with smtplib.SMTP_SSL(self.host, self.port, context=context, timeout=10) as server:
-					server.login(self.username, self.password)
-					logger.info(
-						f'Successfully connected to SMTP server {self.host}:{self.port} via SSL'
-					)
-					return True
-			else:
-				# For non-SSL connections with optional STARTTLS (usually port 587)
-				with smtplib.SMTP(self.host, self.port, timeout=10) as server:
-					# Optional debugging
-					# server.set_debuglevel(1)
-
-					# Say hello to the server
-					server.ehlo()
-
-					# Start TLS encryption if configured
-					if self.use_tls:
-						context = ssl.create_default_context()
-						server.starttls(context=context)
-						server.ehlo()
-
-					# Login to the server
-					server.login(self.username, self.password)
-					logger.info(f'Successfully connected to SMTP server {self.host}:{self.port}')
-					return True
-
+			server = self._connect()
 		except (smtplib.SMTPException, ConnectionRefusedError, TimeoutError) as e:
 			logger.error(f'Failed to connect to SMTP server: {str(e)}')
 			return False
@@ -184,7 +444,115 @@ class EmailService:
 			logger.error(f'Unexpected error checking SMTP connection: {str(e)}')
 			return False
 
-	def send_email(
+		self._release_connection(server)
+		if self._use_ssl:
+			logger.info(f'Successfully connected to SMTP server {self._host}:{self._port} via SSL')
+		else:
+			logger.info(f'Successfully connected to SMTP server {self._host}:{self._port}')
+		return True
+
+	def _pool_key(self) -> tuple:
+		"""Settings that identify which pooled connections can be reused."""
+		return (
+			self._host,
+			self._port,
+			self._username,
+			self._password,
+			self._use_ssl,
+			self._use_tls,
+		)
+
+	def _connect(self) -> smtplib.SMTP:
+		"""Open a new SMTP connection and log in."""
+		if self._use_ssl:
+			server = _PipeliningSMTPSSL(self._host, self._port, context=_ssl_context(), timeout=10)
+		else:
+			server = _PipeliningSMTP(self._host, self._port, timeout=10)
+
+		try:
+			if not self._use_ssl and self._use_tls:
+				server.starttls(context=_ssl_context())
+			server.login(self._username, self._password)
+		except BaseException:
+			server.close()
+			raise
+
+		return server
+
+	def _acquire_connection(self) -> smtplib.SMTP:
+		"""
+		Take a logged in connection from the pool, or open a new one.
+
+		Pooled connections are checked with NOOP first, dead or stale ones are closed.
+		"""
+		key = self._pool_key()
+		while True:
+			with _SMTP_POOL_LOCK:
+				idle = _SMTP_POOL.get(key)
+				if not idle:
+					break
+				server, released_at = idle.pop()
+
+			if time.monotonic() - released_at < _SMTP_POOL_IDLE_SECONDS:
+				try:
+					if server.noop()[0] == 250:
+						server.reused = True
+						return server
+				except (smtplib.SMTPException, OSError):
+					pass
+			_close_smtp_connection(server)
+
+		return self._connect()
+
+	def _sendmail(
+		self, server: smtplib.SMTP, recipients: List[str], message: bytes
+	) -> Tuple[smtplib.SMTP, Dict[str, Tuple[int, bytes]]]:
+		"""
+		Send a message, reconnecting once if the server has dropped an idle connection.
+
+		A pooled connection passes its NOOP check but can still be closed by the server right
+		after, and one kept open between messages can be closed while it waits. The message
+		is only resent if the connection had been used before and the disconnect came before
+		any of the content was sent. After that point the server may already have queued the
+		message, and sending it again would deliver it twice. A connection opened for this
+		message is not retried either. If the retry on a fresh connection fails as well,
+		that connection is closed before the error is raised.
+
+		Returns:
+		    The connection the message was sent over and the recipients the server refused,
+		    as returned by smtplib.SMTP.sendmail
+		"""
+		try:
+			refused = server.sendmail(self._from_email, recipients, message)
+		except smtplib.SMTPServerDisconnected:
+			server.close()
+			if not server.reused or server.content_sent:
+				raise
+		else:
+			server.reused = True
+			return server, refused
+
+		server = self._connect()
+		try:
+			refused = server.sendmail(self._from_email, recipients, message)
+		except BaseException:
+			_close_smtp_connection(server)
+			raise
+		server.reused = True
+		return server, refused
+
+	def _release_connection(self, server: smtplib.SMTP) -> None:
+		"""Return a connection to the pool, or close it if the pool is full."""
+		key = self._pool_key()
+		with _SMTP_POOL_LOCK:
+			idle = _SMTP_POOL.setdefault(key, [])
+			if len(idle) < _SMTP_POOL_MAX_IDLE:
+				idle.append((server, time.monotonic()))
+				return
+
+		_close_smtp_connection(server)
+
+	async def send_email(
 		self,
 		to_email: str,
 		subject: str,
@@ -211,68 +579,57 @@ class EmailService:
 		Returns:
 		    bool: True if email was sent successfully, False otherwise
 		"""
+		return await run_in_threadpool(
+			self._send_email,
+			to_email=to_email,
+			subject=subject,
+			html_content=html_content,
+			text_content=text_content,
+			cc=cc,
+			bcc=bcc,
+			reply_to=reply_to,
+			attachments=attachments,
+		)
+
+	def _send_email(
+		self,
+		to_email: str,
+		subject: str,
+		html_content: str,
+		text_content: Optional[str] = None,
+		cc: Optional[List[str]] = None,
+		bcc: Optional[List[str]] = None,
+		reply_to: Optional[str] = None,
+		attachments: Optional[Dict] = None,
+	) -> bool:
+		"""Blocking implementation of send_email."""
 		if not self.is_configured():
 			logger.warning('SMTP is not fully configured - cannot send email')
 			return False
 
-		# Validate the email service is ready
-		if not self.check_smtp_connection():
-			logger.error('Cannot send email - SMTP connection failed')
-			return False
-
 		try:
-			# Create message
-			message = MIMEMultipart('alternative')
-			message['Subject'] = subject
-			message['From'] = (
-				f'{self.from_name} <{self.from_email}>' if self.from_name else self.from_email
+			message, recipients = self._build_message(
+				OutgoingEmail(
+					to_email=to_email,
+					subject=subject,
+					html_content=html_content,
+					text_content=text_content,
+					cc=cc,
+					bcc=bcc,
+					reply_to=reply_to,
+					attachments=attachments,
+				)
 			)
-			message['To'] = to_email
-
-			# Add CC and BCC if provided
-			if cc:
-				message['Cc'] = ', '.join(cc)
-			if bcc:
-				message['Bcc'] = ', '.join(bcc)
-
-			# Add Reply-To if provided
-			if reply_to:
-				message['Reply-To'] = reply_to
-
-			# Add plain text and HTML parts
-			if text_content:
-				message.attach(MIMEText(text_content, 'plain'))
-			message.attach(MIMEText(html_content, 'html'))
-
-			# Add attachments if any (simplified implementation)
-			# A complete implementation would handle more attachment types
-			if attachments:
-				for filename, content in attachments.items():
-					# This is simplified - would need expansion for different attachment types
-					part = MIMEText(content)
-					part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
-					message.attach(part)
-
-			# Determine all recipients
-			recipients = [to_email]
-			if cc:
-				recipients.extend(cc)
-			if bcc:
-				recipients.extend(bcc)
-
-			# Connect to SMTP server and send email
-			if self.use_ssl:
-				context = ssl.create_default_context()
-				with smtplib.SMTP_SSL(self.host, self.port, context=context) as server:
-					server.login(self.username, self.password)
-					server.sendmail(self.from_email, recipients, message.as_string())
-			else:
-				with smtplib.SMTP(self.host, self.port) as server:
-					if self.use_tls:
-						context = ssl.create_default_context()
-						server.starttls(context=context)
-					server.login(self.username, self.password)
-					server.sendmail(self.from_email, recipients, message.as_string())
+
+			# Send over a pooled connection. There is no separate connectivity check first,
+			# connection and login failures are handled by the except clauses below.
+			server = self._acquire_connection()
+			try:
+				server, _ = self._sendmail(server, recipients, message)
+			except BaseException:
+				_close_smtp_connection(server)
+				raise
+			self._release_connection(server)
 
 			logger.info(f'Email sent successfully to {to_email}')
 			return True
@@ -283,3 +640,224 @@ class EmailService:
 		except Exception as e:
 			logger.error(f'Unexpected error sending email: {str(e)}')
 			return False
+
+	async def send_bulk(
+		self, emails: List[OutgoingEmail], chunk_size: int = 100, group_by_domain: bool = False
+	) -> List[BulkSendResult]:
+		"""
+		Send several emails, reusing each SMTP connection and login for many of them.
+
+		By default each email is its own SMTP transaction. With group_by_domain, emails with
+		the same content and no cc or bcc are grouped by the domain of their recipient, and
+		each group is delivered by one transaction, so the message is transferred once per
+		domain instead of once per recipient. Grouped messages carry an undisclosed-recipients
+		To header instead of the recipient's address.
+
+		Temporary failures (4xx replies) are retried with exponential backoff. A recipient
+		the server refuses within a group is reported as failed without a retry. Providers
+		cap the number of messages per connection, so a new connection is opened after
+		every chunk_size messages.
+
+		Args:
+		    emails: The emails to send, in order
+		    chunk_size: Maximum number of messages sent over one connection
+		    group_by_domain: Whether to deliver emails with the same content and recipient
+		        domain in one transaction
+
+		Returns:
+		    List[BulkSendResult]: The outcome of each email, in the same order
+		"""
+		return await run_in_threadpool(self._send_bulk, emails, chunk_size, group_by_domain)
+
+	def _send_bulk(
+		self, emails: List[OutgoingEmail], chunk_size: int, group_by_domain: bool = False
+	) -> List[BulkSendResult]:
+		"""Blocking implementation of send_bulk."""
+		if not self.is_configured():
+			logger.warning('SMTP is not fully configured - cannot send email')
+			return [
+				BulkSendResult(email.to_email, False, 'SMTP is not configured') for email in emails
+			]
+
+		results: List[Optional[BulkSendResult]] = [None] * len(emails)
+		transactions = self._plan_bulk(emails, group_by_domain, results)
+
+		server: Optional[smtplib.SMTP] = None
+		sent_on_connection = 0
+		try:
+			for transaction in transactions:
+				grouped = len(transaction.indexes) > 1
+				if grouped:
+					message = _UNDISCLOSED_TO_HEADER + transaction.body
+				else:
+					message = _to_header(emails[transaction.indexes[0]].to_email) + transaction.body
+
+				error: Optional[Exception] = None
+				refused: Dict[str, Tuple[int, bytes]] = {}
+				connection_failed = False
+				for attempt in range(_BULK_SEND_RETRIES + 1):
+					if attempt:
+						time.sleep(_BULK_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+					if server is None:
+						try:
+							server = self._acquire_connection()
+							sent_on_connection = 0
+						except Exception as e:
+							error, connection_failed = e, True
+							if _is_transient_smtp_error(e):
+								continue
+							break
+
+					try:
+						server, refused = self._sendmail(server, transaction.recipients, message)
+						error = None
+					except (
+						smtplib.SMTPRecipientsRefused,
+						smtplib.SMTPSenderRefused,
+						smtplib.SMTPDataError,
+					) as e:
+						# The server rejected this message, the connection is still usable
+						error = e
+					except Exception as e:
+						# The connection is in an unknown state, open a new one for the next try
+						error = e
+						_close_smtp_connection(server)
+						server = None
+
+					connection_failed = False
+					if error is None or not _is_transient_smtp_error(error):
+						break
+
+				if error is None:
+					sent_on_connection += 1
+
+				for index in transaction.indexes:
+					to_email = emails[index].to_email
+					failure = error
+					if failure is None and grouped and to_email in refused:
+						# Refused CC and BCC addresses of a single email do not fail it
+						failure = smtplib.SMTPRecipientsRefused({to_email: refused[to_email]})
+
+					if failure is None:
+						logger.info(f'Email sent successfully to {to_email}')
+						results[index] = BulkSendResult(to_email, True)
+					else:
+						logger.error(f'Failed to send email: {str(failure)}')
+						results[index] = BulkSendResult(to_email, False, str(failure))
+
+				if connection_failed:
+					# Without a connection none of the remaining emails can be sent
+					for index, result in enumerate(results):
+						if result is None:
+							results[index] = BulkSendResult(
+								emails[index].to_email, False, str(error)
+							)
+					break
+
+				if server is not None and sent_on_connection >= chunk_size:
+					_close_smtp_connection(server)
+					server = None
+		finally:
+			if server is not None:
+				self._release_connection(server)
+
+		return results
+
+	def _plan_bulk(
+		self,
+		emails: List[OutgoingEmail],
+		group_by_domain: bool,
+		results: List[Optional[BulkSendResult]],
+	) -> List[_BulkTransaction]:
+		"""
+		Render the emails of a send_bulk call and split them into SMTP transactions.
+
+		Emails that only differ in their recipient share one rendered body. An email that
+		fails to render is recorded as failed in results and left out.
+
+		Returns:
+		    The transactions, in the order of their first email
+		"""
+		transactions: List[_BulkTransaction] = []
+		rendered: Dict[tuple, bytes] = {}
+		groups: Dict[tuple, _BulkTransaction] = {}
+		for index, email in enumerate(emails):
+			try:
+				body_key = _body_key(email)
+				body = rendered.get(body_key)
+				if body is None:
+					body = rendered[body_key] = self._render_message(email)
+
+				if group_by_domain and not email.cc and not email.bcc:
+					group_key = (body_key, _domain(email.to_email))
+					group = groups.get(group_key)
+					if group is None or len(group.recipients) >= _BULK_GROUP_MAX_RECIPIENTS:
+						group = groups[group_key] = _BulkTransaction([], body, [])
+						transactions.append(group)
+					group.indexes.append(index)
+					group.recipients.append(email.to_email)
+				else:
+					transactions.append(_BulkTransaction([index], body, _recipients(email)))
+			except Exception as e:
+				logger.error(f'Unexpected error sending email: {str(e)}')
+				results[index] = BulkSendResult(email.to_email, False, str(e))
+
+		return transactions
+
+	def _build_message(self, email: OutgoingEmail) -> Tuple[bytes, List[str]]:
+		"""
+		Build the serialized message for an email.
+
+		Args:
+		    email: The email to build
+
+		Returns:
+		    The serialized message and the envelope recipients (To, CC and BCC addresses)
+		"""
+		return _to_header(email.to_email) + self._render_message(email), _recipients(email)
+
+	def _render_message(self, email: OutgoingEmail) -> bytes:
+		"""
+		Serialize everything of an email's message except the To header.
+
+		Only the To header differs between recipients of the same email body, so bulk sends
+		render the (possibly large) rest once and reuse it.
+
+		Args:
+		    email: The email to render
+
+		Returns:
+		    The serialized message without a To header
+		"""
+		# Create message
+		message = MIMEMultipart('alternative')
+		message['Subject'] = email.subject
+		message['From'] = self._from_header
+
+		# Add CC if provided. BCC addresses are envelope recipients only, a Bcc header would
+		# reveal them to everyone who receives the message.
+		if email.cc:
+			message['Cc'] = ', '.join(email.cc)
+
+		# Add Reply-To if provided
+		if email.reply_to:
+			message['Reply-To'] = email.reply_to
+
+		# Add plain text and HTML parts, deriving the text from the HTML when none was given
+		text_content = email.text_content or html_to_text(email.html_content)
+		if text_content:
+			message.attach(MIMEText(text_content, 'plain'))
+		message.attach(MIMEText(email.html_content, 'html'))
+
+		# Add attachments if any (simplified implementation)
+		# A complete implementation would handle more attachment types
+		if email.attachments:
+			for filename, content in email.attachments.items():
+				# This is simplified - would need expansion for different attachment types
+				part = MIMEText(content)
+				part.add_header('Content-Disposition', f'attachment; filename="{filename}"')
+				message.attach(part)
+
+		# Generated as bytes, which sendmail passes to the socket without re-encoding
+		return message.as_bytes(policy=_WIRE_POLICY)
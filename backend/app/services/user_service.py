@@ -1,4 +1,6 @@
-from sqlmodel import Session, select
+from sqlalchemy import exists
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.user import User
 from app.services.auth_service import AuthService
@@ -7,7 +9,7 @@ from app.utils.password_validator import validate_password
 
 
 class UserService:
-	def __init__(self, db: Session):
+	def __init__(self, db: AsyncSession):
 		"""
 		Initialize the user service.
 
@@ -17,18 +19,20 @@ class UserService:
 		self.db = db
 		self.auth_service = AuthService(db)
 
-	def is_first_admin_created(self) -> bool:
+	async def is_first_admin_created(self) -> bool:
 		"""
 		Check if the first admin user has already been created.
 
 		Returns:
 			bool: True if any user exists in the system, False otherwise
 		"""
-		statement = select(User)
-		existing_user = self.db.exec(statement).first()
-		return existing_user is not None
+		# EXISTS stops at the first row instead of fetching the whole table
+		statement = select(exists().select_from(User))
+		return (await self.db.exec(statement)).one()
 
-	def create_first_admin(self, name: str, email: str, password: str) -> tuple[User, str, str]:
+	async def create_first_admin(
+		self, name: str, email: str, password: str
+	) -> tuple[User, str, str]:
 		"""
 		Create the first admin user in the system, only if no users exist.
 
@@ -45,10 +49,7 @@ class UserService:
 		    InvalidPasswordError: If the password doesn't meet security requirements
 		"""
 		# Check if any users exist
-		statement = select(User)
-		existing_user = self.db.exec(statement).first()
-
-		if existing_user:
+		if await self.is_first_admin_created():
 			raise UserAlreadyExistsError(
 				'Admin cannot be registered: users already exist in the system'
 			)
@@ -59,17 +60,17 @@ class UserService:
 			raise InvalidPasswordError(f'Password validation failed: {", ".join(error_messages)}')
 
 		# Hash the password
-		hashed_password = self.auth_service.get_password_hash(password)
+		hashed_password = await self.auth_service.get_password_hash(password)
 
 		# Create the user with admin privileges
 		user = User(name=name, email=email, password=hashed_password, is_admin=True)
 
+		# Server-set columns come back through RETURNING, so the user needs no refresh
 		self.db.add(user)
-		self.db.commit()
-		self.db.refresh(user)
+		await self.db.commit()
 
 		# Generate tokens for auto login
 		access_token = self.auth_service.create_access_token(subject=user.id)
-		refresh_token = self.auth_service.create_refresh_token(user_id=user.id)
+		refresh_token = await self.auth_service.create_refresh_token(user_id=user.id)
 
 		return user, access_token, refresh_token
@@ -1,5 +1,10 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import text
+
+# Database-side equivalent of datetime_utcnow(): current UTC time as a naive timestamp
+UTCNOW_SQL = text("timezone('utc', now())")
+
 
 def datetime_utcnow():
 	return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -5,21 +5,65 @@ This module contains functions that generate HTML and plain text email templates
 for different purposes like authentication codes, password resets, etc.
 """
 
+from functools import lru_cache
+from html.parser import HTMLParser
+from textwrap import dedent
 
-def get_auth_code_email(user_name: str, code: str, expires_minutes: int) -> tuple[str, str]:
+
+class _TextExtractor(HTMLParser):
+	"""Collects the visible text of an HTML document, one line per block element."""
+
+	_BLOCK_TAGS = frozenset(
+		{'br', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'p', 'table', 'tr'}
+	)
+	_SKIPPED_TAGS = frozenset({'head', 'script', 'style', 'title'})
+
+	def __init__(self):
+		super().__init__()
+		self.parts: list[str] = []
+		self._skip_depth = 0
+
+	def handle_starttag(self, tag, attrs):
+		if tag in self._SKIPPED_TAGS:
+			self._skip_depth += 1
+		elif tag in self._BLOCK_TAGS:
+			self.parts.append('\n')
+
+	def handle_endtag(self, tag):
+		if tag in self._SKIPPED_TAGS:
+			self._skip_depth = max(self._skip_depth - 1, 0)
+		elif tag in self._BLOCK_TAGS:
+			self.parts.append('\n')
+
+	def handle_data(self, data):
+		if not self._skip_depth:
+			self.parts.append(data)
+
+
+@lru_cache(maxsize=512)
+def html_to_text(html_content: str) -> str:
 	"""
-	Generate HTML and plain text templates for authentication code emails.
+	Derive a plain text version of an HTML email body.
+
+	Used as the text alternative of emails sent without one. Results are cached, so
+	sending the same body again does not parse it again.
 
 	Args:
-	    user_name: The name of the user receiving the code
-	    code: The authentication code
-	    expires_minutes: The expiration time in minutes
+	    html_content: The HTML body
 
 	Returns:
-	    tuple[str, str]: A tuple containing (html_content, text_content)
+	    str: The text of the body, with block elements separated by blank lines
 	"""
-	# HTML version
-	html_content = f"""
+	extractor = _TextExtractor()
+	extractor.feed(html_content)
+	extractor.close()
+
+	lines = (' '.join(line.split()) for line in ''.join(extractor.parts).splitlines())
+	return '\n\n'.join(line for line in lines if line)
+
+
+# Templates are dedented once at import, so sent bodies carry no source indentation
+_AUTH_CODE_HTML = dedent("""\
     <html>
         <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
             <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
@@ -30,10 +74,9 @@ def get_auth_code_email(user_name: str, code: str, expires_minutes: int) -> tupl
             </div>
         </body>
     </html>
-    """
+    """)
 
-	# Plain text version
-	text_content = f"""
+_AUTH_CODE_TEXT = dedent("""\
     Hello {user_name},
 
     Your authentication code is: {code}
@@ -41,25 +84,9 @@ def get_auth_code_email(user_name: str, code: str, expires_minutes: int) -> tupl
     This code will expire in {expires_minutes} minutes.
 
     If you did not request this code, please ignore this email.
-    """
-
-	return html_content, text_content
+    """)
 
-
-def get_password_reset_email(user_name: str, code: str, expires_minutes: int) -> tuple[str, str]:
-	"""
-	Generate HTML and plain text templates for password reset emails.
-
-	Args:
-	    user_name: The name of the user receiving the code
-	    code: The reset code
-	    expires_minutes: The expiration time in minutes
-
-	Returns:
-	    tuple[str, str]: A tuple containing (html_content, text_content)
-	"""
-	# HTML version
-	html_content = f"""
+_PASSWORD_RESET_HTML = dedent("""\
     <html>
         <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
             <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
@@ -71,10 +98,9 @@ def get_password_reset_email(user_name: str, code: str, expires_minutes: int) ->
             </div>
         </body>
     </html>
-    """
+    """)
 
-	# Plain text version
-	text_content = f"""
+_PASSWORD_RESET_TEXT = dedent("""\
     Hello {user_name},
 
     You recently requested to reset your password.
@@ -84,22 +110,9 @@ def get_password_reset_email(user_name: str, code: str, expires_minutes: int) ->
     This code will expire in {expires_minutes} minutes.
 
     If you did not request a password reset, please ignore this email or contact support.
-    """
-
-	return html_content, text_content
-
-
-def get_test_email() -> tuple[str, str]:
-	"""
-	Generate HTML and plain text templates for test emails.
+    """)
 
-	Used to verify SMTP settings are working correctly.
-
-	Returns:
-	    tuple[str, str]: A tuple containing (html_content, text_content)
-	"""
-	# HTML version
-	html_content = """
+_TEST_EMAIL_HTML = dedent("""\
     <html>
         <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
             <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 5px;">
@@ -114,10 +127,9 @@ def get_test_email() -> tuple[str, str]:
             </div>
         </body>
     </html>
-    """
+    """)
 
-	# Plain text version
-	text_content = """
+_TEST_EMAIL_TEXT = dedent("""\
     SMTP Test Email
 
     This is a test email to verify that your SMTP settings are configured correctly.
@@ -126,6 +138,48 @@ def get_test_email() -> tuple[str, str]:
 
     ---
     This is an automated test message. Please do not reply to this email.
-    """
+    """)
+
+
+def get_auth_code_email(user_name: str, code: str, expires_minutes: int) -> tuple[str, str]:
+	"""
+	Generate HTML and plain text templates for authentication code emails.
+
+	Args:
+	    user_name: The name of the user receiving the code
+	    code: The authentication code
+	    expires_minutes: The expiration time in minutes
+
+	Returns:
+	    tuple[str, str]: A tuple containing (html_content, text_content)
+	"""
+	fields = {'user_name': user_name, 'code': code, 'expires_minutes': expires_minutes}
+	return _AUTH_CODE_HTML.format_map(fields), _AUTH_CODE_TEXT.format_map(fields)
+
+
+def get_password_reset_email(user_name: str, code: str, expires_minutes: int) -> tuple[str, str]:
+	"""
+	Generate HTML and plain text templates for password reset emails.
+
+	Args:
+	    user_name: The name of the user receiving the code
+	    code: The reset code
+	    expires_minutes: The expiration time in minutes
+
+	Returns:
+	    tuple[str, str]: A tuple containing (html_content, text_content)
+	"""
+	fields = {'user_name': user_name, 'code': code, 'expires_minutes': expires_minutes}
+	return _PASSWORD_RESET_HTML.format_map(fields), _PASSWORD_RESET_TEXT.format_map(fields)
 
-	return html_content, text_content
+
+def get_test_email() -> tuple[str, str]:
+	"""
+	Generate HTML and plain text templates for test emails.
+
+	Used to verify SMTP settings are working correctly.
+
+	Returns:
+	    tuple[str, str]: A tuple containing (html_content, text_content)
+	"""
+	return _TEST_EMAIL_HTML, _TEST_EMAIL_TEXT
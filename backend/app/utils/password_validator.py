@@ -1,6 +1,31 @@
-import re
+import string
 from typing import List, Tuple
 
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+_ASCII_DIGITS = frozenset(string.digits)
+_ASCII_ALPHANUMERICS = _ASCII_LETTERS | _ASCII_DIGITS
+
+
+def _has_character_mix(password: str) -> bool:
+	"""
+	Check whether a password has at least two of letters, numbers and symbols.
+
+	Matches the former regex checks: letters are ASCII letters, numbers are any decimal
+	digits and symbols are anything but ASCII letters, ASCII digits and whitespace. The
+	password's distinct characters are collected once and tested with set operations,
+	only characters outside ASCII letters and digits are looked at one by one.
+	"""
+	characters = set(password)
+	has_letter = not characters.isdisjoint(_ASCII_LETTERS)
+	has_number = not characters.isdisjoint(_ASCII_DIGITS)
+
+	others = characters - _ASCII_ALPHANUMERICS
+	has_symbol = any(not char.isspace() for char in others)
+	# Non-ASCII digits count as both, as they did with \d and [^a-zA-Z0-9\s]
+	has_number = has_number or any(char.isdecimal() for char in others)
+
+	return has_letter + has_number + has_symbol >= 2
+
 
 def validate_password(password: str) -> Tuple[bool, List[str]]:
 	"""
@@ -29,14 +54,8 @@ def validate_password(password: str) -> Tuple[bool, List[str]]:
 	if password.startswith(' ') or password.endswith(' '):
 		errors.append('Password cannot begin or end with a blank space')
 
-	# Check for combination of characters
-	has_letter = bool(re.search(r'[a-zA-Z]', password))
-	has_number = bool(re.search(r'\d', password))
-	has_symbol = bool(re.search(r'[^a-zA-Z0-9\s]', password))
-
 	# Password must have at least two of the three categories
-	categories_present = [has_letter, has_number, has_symbol].count(True)
-	if categories_present < 2:
+	if not _has_character_mix(password):
 		errors.append('Password must contain a combination of letters, numbers, and/or symbols')
 
 	return len(errors) == 0, errors
@@ -1,32 +1,94 @@
+import hashlib
+import math
 import time
-from collections import defaultdict
-from typing import Dict, List, Tuple
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+def _key_digest(key: str) -> int:
+	"""
+	64-bit digest of a rate limit key, stored in place of the key itself.
+
+	Keys are email addresses and IPs of any length, a fixed-size int keeps entries small and
+	quick to hash. A collision would only make two keys share a limit, which is negligible
+	at 64 bits for the keys seen within a window.
+	"""
+	return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
 
 
 class RateLimiter:
 	"""
 	A simple in-memory rate limiter to protect against brute force attacks.
-	Uses a sliding window algorithm to track attempts.
+	Counts attempts per key in fixed time buckets, so the memory used per key is bounded by
+	the number of buckets in the window, however many attempts are made.
 	"""
 
-	def __init__(self, max_attempts: int = 5, window_seconds: int = 300):
+	def __init__(self, max_attempts: int = 5, window_seconds: int = 300, bucket_seconds: int = 60):
 		"""
 		Initialize the rate limiter.
 
 		Args:
 		    max_attempts: Maximum number of attempts allowed in the time window
-		    window_seconds: Size of the sliding window in seconds
+		    window_seconds: Size of the time window in seconds
+		    bucket_seconds: Granularity of the attempt counters in seconds. The window moves
+		        forward one bucket at a time, so it covers between window_seconds minus one
+		        bucket and window_seconds.
 		"""
 		self.max_attempts = max_attempts
 		self.window_seconds = window_seconds
-		# Store attempts as {key: [(timestamp1), (timestamp2), ...]}
-		self._attempts: Dict[str, List[float]] = defaultdict(list)
+		self.bucket_seconds = bucket_seconds
+		self._window_buckets = max(1, math.ceil(window_seconds / bucket_seconds))
+		# Store attempt counts as {key digest: deque of (bucket, count)}, oldest bucket first,
+		# where bucket is time // bucket_seconds. Keys without attempts in the window are removed.
+		self._attempts: Dict[int, Deque[Tuple[int, int]]] = {}
+		# Bucket from which the next sweep of expired keys is due, see _sweep
+		self._next_sweep_bucket = 0
+
+	def _current_bucket(self) -> int:
+		"""Index of the bucket the current time falls into"""
+		return int(time.time() // self.bucket_seconds)
+
+	def _sweep(self, current_bucket: int) -> None:
+		"""
+		Remove the keys without attempts in the current window, at most once per window.
 
-	def _clean_old_attempts(self, key: str) -> None:
-		"""Remove attempts outside the current time window"""
-		now = time.time()
-		cutoff = now - self.window_seconds
-		self._attempts[key] = [ts for ts in self._attempts[key] if ts > cutoff]
+		Expired buckets are otherwise only dropped when their key is looked up again, so keys
+		seen once (e.g. a single failed login per address) would be kept forever.
+		"""
+		if current_bucket < self._next_sweep_bucket:
+			return
+
+		self._next_sweep_bucket = current_bucket + self._window_buckets
+		oldest_bucket = current_bucket - self._window_buckets + 1
+		# The newest bucket is last, a key is expired when that one is
+		expired = [key for key, buckets in self._attempts.items() if buckets[-1][0] < oldest_bucket]
+		for key in expired:
+			del self._attempts[key]
+
+	def _count_attempts(self, key: int, current_bucket: int) -> int:
+		"""Drop buckets outside the current time window and count the attempts left in it"""
+		# A lookup must not create an entry, probing unknown keys would grow the dict
+		buckets = self._attempts.get(key)
+		if buckets is None:
+			return 0
+
+		oldest_bucket = current_bucket - self._window_buckets + 1
+		while buckets and buckets[0][0] < oldest_bucket:
+			buckets.popleft()
+		if not buckets:
+			del self._attempts[key]
+			return 0
+
+		return sum(count for _, count in buckets)
+
+	def _add_attempt(self, key: int, current_bucket: int) -> None:
+		"""Count one attempt for key in the current bucket"""
+		buckets = self._attempts.setdefault(key, deque())
+		if buckets and buckets[-1][0] >= current_bucket:
+			bucket, count = buckets[-1]
+			buckets[-1] = (bucket, count + 1)
+		else:
+			buckets.append((current_bucket, 1))
 
 	def is_rate_limited(self, key: str) -> Tuple[bool, int]:
 		"""
@@ -38,14 +100,38 @@ class RateLimiter:
 		Returns:
 		    Tuple[bool, int]: (is_limited, remaining_attempts)
 		"""
-		self._clean_old_attempts(key)
-		attempts = len(self._attempts[key])
+		current_bucket = self._current_bucket()
+		self._sweep(current_bucket)
+		attempts = self._count_attempts(_key_digest(key), current_bucket)
 
 		if attempts >= self.max_attempts:
 			return True, 0
 
 		return False, self.max_attempts - attempts
 
+	def check_and_record(self, key: str) -> Tuple[bool, int]:
+		"""
+		Check if a key is rate limited and, if it is not, record an attempt in the same step.
+
+		Attempts made while limited are not recorded, so they do not extend the lockout.
+
+		Args:
+		    key: The unique identifier to check and track
+
+		Returns:
+		    Tuple[bool, int]: (is_limited, remaining_attempts after this one)
+		"""
+		current_bucket = self._current_bucket()
+		self._sweep(current_bucket)
+		digest = _key_digest(key)
+		attempts = self._count_attempts(digest, current_bucket)
+
+		if attempts >= self.max_attempts:
+			return True, 0
+
+		self._add_attempt(digest, current_bucket)
+		return False, self.max_attempts - attempts - 1
+
 	def record_attempt(self, key: str) -> None:
 		"""
 		Record an authentication attempt.
@@ -53,7 +139,9 @@ class RateLimiter:
 		Args:
 		    key: The unique identifier to track
 		"""
-		self._attempts[key].append(time.time())
+		current_bucket = self._current_bucket()
+		self._sweep(current_bucket)
+		self._add_attempt(_key_digest(key), current_bucket)
 
 	def reset(self, key: str) -> None:
 		"""
@@ -62,8 +150,7 @@ class RateLimiter:
 		Args:
 		    key: The unique identifier to reset
 		"""
-		if key in self._attempts:
-			del self._attempts[key]
+		self._attempts.pop(_key_digest(key), None)
 
 
 # Create a global rate limiter instance with default settings
@@ -1,6 +1,8 @@
 import json
 import logging
+import queue
 import uuid
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Optional
 
 # Create a custom logger for security events
@@ -11,8 +13,20 @@ logger.setLevel(logging.INFO)
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 
-# Create a custom formatter that includes more details
-formatter = logging.Formatter(
+
+class _SecurityFormatter(logging.Formatter):
+	"""Formatter that serializes the details of a record as JSON when it is written."""
+
+	def format(self, record: logging.LogRecord) -> str:
+		details = getattr(record, 'details', None)
+		if not isinstance(details, str):
+			record.details = json.dumps(details)
+		return super().format(record)
+
+
+# Create a custom formatter that includes more details. Details are serialized by the
+# formatter, so with queued logging that work happens on the listener thread too.
+formatter = _SecurityFormatter(
 	'{"timestamp": "%(asctime)s", "level": "%(levelname)s", "event_type": "%(event_type)s", "message": "%(msg)s", "details": %(details)s}',
 	datefmt='%Y-%m-%d %H:%M:%S',
 )
@@ -21,6 +35,26 @@ console_handler.setFormatter(formatter)
 # Add the handlers to the logger
 logger.addHandler(console_handler)
 
+# While the app is running, records are handed to a queue and written by a listener thread,
+# so request handlers do not block on the stream
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_queue_listener = QueueListener(_log_queue, console_handler)
+
+
+def start_queued_logging() -> None:
+	"""Route security log records through the queue and start the listener thread."""
+	logger.removeHandler(console_handler)
+	logger.addHandler(_queue_handler)
+	_queue_listener.start()
+
+
+def stop_queued_logging() -> None:
+	"""Flush the queued records, stop the listener thread and write directly again."""
+	_queue_listener.stop()
+	logger.removeHandler(_queue_handler)
+	logger.addHandler(console_handler)
+
 
 class SecurityLogger:
 	"""
@@ -40,7 +74,7 @@ class SecurityLogger:
 		details['event_id'] = str(uuid.uuid4())
 
 		# Use 'msg' instead of 'message' to avoid collision with the built-in message attribute
-		return {'event_type': event_type, 'details': json.dumps(details)}
+		return {'event_type': event_type, 'details': details}
 
 	@staticmethod
 	def log_login_attempt(
@@ -1,30 +1,62 @@
-from datetime import datetime, timedelta
+import asyncio
+import time
 from typing import Optional
 
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.services.email_service import EmailService
 
 
 class SMTPStatusCache:
-	"""Cache for SMTP status to avoid frequent connection checks"""
+	"""
+	Cache for SMTP status to avoid frequent connection checks.
 
-	def __init__(
-		self, db: Optional[Session] = None, cache_ttl_seconds: int = 300
-	):  # 5 minutes cache by default
+	One instance is shared by the whole process (smtp_status_cache), so requests arriving
+	while a check is running wait for its result instead of each logging in to the server.
+	"""
+
+	def __init__(self, cache_ttl_seconds: int = 300):  # 5 minutes cache by default
 		self.status: Optional[bool] = None
-		self.last_check: Optional[datetime] = None
-		self.cache_ttl = timedelta(seconds=cache_ttl_seconds)
-		self.db = db
-		self._email_service = EmailService(db)
+		# time.monotonic() of the last check, unaffected by wall clock changes
+		self.last_check: Optional[float] = None
+		self.cache_ttl_seconds = cache_ttl_seconds
+		# Concurrent callers wait for the check in progress instead of starting their own
+		self._lock = asyncio.Lock()
+
+	def _is_expired(self) -> bool:
+		"""Whether the status was never checked or the cache has expired"""
+		return (
+			self.last_check is None or time.monotonic() - self.last_check > self.cache_ttl_seconds
+		)
+
+	def invalidate(self) -> None:
+		"""Discard the cached status, the next get_status call checks the connection again"""
+		self.last_check = None
+
+	async def get_status(self, db: AsyncSession) -> bool:
+		"""
+		Get cached status or check SMTP connection if cache expired.
+
+		Args:
+		    db: Session of the calling request, used to read the SMTP credentials if a
+		        check is due
+
+		Returns:
+		    bool: Whether the SMTP server accepted a connection and login
+		"""
+		if not self._is_expired():
+			return self.status
+
+		async with self._lock:
+			# Another caller may have refreshed the status while this one was waiting
+			if self._is_expired():
+				email_service = EmailService(db)
+				await email_service.refresh_credentials()
+				self.status = await email_service.check_smtp_connection()
+				self.last_check = time.monotonic()
 
-	def get_status(self) -> bool:
-		"""Get cached status or check SMTP connection if cache expired"""
-		current_time = datetime.now()
+		return self.status
 
-		# If we've never checked or the cache has expired
-		if self.last_check is None or (current_time - self.last_check) > self.cache_ttl:
-			self.status = self._email_service.check_smtp_connection()
-			self.last_check = current_time
 
-		return self.status
+# Process-wide cache, shared by all requests
+smtp_status_cache = SMTPStatusCache()
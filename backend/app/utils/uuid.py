@@ -0,0 +1,27 @@
+import os
+import time
+import uuid
+
+_RAND_B_MASK = (1 << 62) - 1
+
+
+def uuid7() -> uuid.UUID:
+	"""
+	Generate a time-ordered UUID version 7 (RFC 9562).
+
+	The first 48 bits hold the Unix timestamp in milliseconds, so newly generated
+	ids sort after older ones and index inserts land on the right edge of the B-tree.
+
+	Returns:
+	    A new UUIDv7
+	"""
+	timestamp_ms = time.time_ns() // 1_000_000
+	rand = int.from_bytes(os.urandom(10), 'big')
+
+	value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+	value |= 0x7 << 76  # version
+	value |= ((rand >> 62) & 0xFFF) << 64  # rand_a
+	value |= 0b10 << 62  # variant
+	value |= rand & _RAND_B_MASK  # rand_b
+
+	return uuid.UUID(int=value)